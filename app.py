@@ -17,6 +17,7 @@ EcoGuardian AI - Streamlit Web Interface
 
 import streamlit as st
 import asyncio
+import functools
 import sys
 from pathlib import Path
 
@@ -34,6 +35,7 @@ from datetime import datetime
 # Add this OUTSIDE the EcoGuardianSystem class
 # (at the top of your app.py, after imports)
 
+@functools.lru_cache(maxsize=256)
 def _calculate_duration(start_time, end_time):
     """Calculate duration between start and end times"""
     if not start_time or not end_time:
@@ -3,21 +3,41 @@ Advanced Agent Evaluation System
 Demonstrates sophisticated agent self-assessment
 """
 
+import bisect
+import functools
 import json
 from typing import Dict, List, Any
 from datetime import datetime
+from types import MappingProxyType
+
+# Grade cutoffs in descending order; negated so bisect can search them ascending
+_GRADE_CUTOFFS = (95, 90, 85, 80, 75, 70)
+_GRADE_LABELS = ("A+", "A", "B+", "B", "C+", "C")
+_NEG_CUTOFFS = tuple(-c for c in _GRADE_CUTOFFS)
+
+# Prediction fields that must be present and non-empty for full completeness
+_REQUIRED_FIELDS = ("interventions", "average_confidence", "city")
 
 class AgentEvaluator:
     """Evaluates agent performance with multiple metrics"""
     
+    BENCHMARKS = MappingProxyType({
+        "prediction_accuracy": 0.85,  # 85% target
+        "response_time": 5.0,  # 5 seconds max
+        "deployment_success": 0.95,  # 95% success rate
+        "data_completeness": 0.90  # 90% complete data
+    })
+    
     def __init__(self):
         self.evaluation_history = []
-        self.benchmarks = {
-            "prediction_accuracy": 0.85,  # 85% target
-            "response_time": 5.0,  # 5 seconds max
-            "deployment_success": 0.95,  # 95% success rate
-            "data_completeness": 0.90  # 90% complete data
-        }
+        
+        # Running aggregates over evaluation_history, kept in step by
+        # evaluate_prediction_quality so reports don't rescan the history
+        self._count = 0
+        self._score_sum = 0.0
+        self._score_min = float("inf")
+        self._score_max = float("-inf")
+        self._pass_count = 0
     
     def evaluate_prediction_quality(
         self, 
@@ -32,11 +52,9 @@ class AgentEvaluator:
         }
         
         # 1. Completeness Score
-        required_fields = ["interventions", "average_confidence", "city"]
         completeness = sum(
-            1 for field in required_fields 
-            if field in predictions and predictions[field]
-        ) / len(required_fields)
+            1 for field in _REQUIRED_FIELDS if predictions.get(field)
+        ) / len(_REQUIRED_FIELDS)
         evaluation["metrics"]["completeness"] = round(completeness * 100, 2)
         
         # 2. Confidence Score
@@ -45,12 +63,13 @@ class AgentEvaluator:
         evaluation["metrics"]["confidence_quality"] = round(confidence_score, 2)
         
         # 3. Intervention Relevance
-        interventions = predictions.get("interventions", [])
-        high_priority = sum(
-            1 for i in interventions 
-            if i.get("priority_level") == "High"
-        )
-        relevance = (high_priority / len(interventions) * 100) if interventions else 0
+        total_interventions = 0
+        high_priority = 0
+        for i in predictions.get("interventions", []):
+            total_interventions += 1
+            if i.get("priority_level") == "High":
+                high_priority += 1
+        relevance = (high_priority / total_interventions * 100) if total_interventions else 0
         evaluation["metrics"]["intervention_relevance"] = round(relevance, 2)
         
         # 4. Overall Quality Score
@@ -63,11 +82,24 @@ class AgentEvaluator:
         
         # 5. Pass/Fail
         evaluation["status"] = "PASS" if overall >= 70 else "FAIL"
-        evaluation["grade"] = self._get_grade(overall)
+        # Graded on the reported (rounded) score so repeated scores hit the cache
+        evaluation["grade"] = self._get_grade(evaluation["metrics"]["overall_quality"])
         
         self.evaluation_history.append(evaluation)
+        self._record_score(evaluation["metrics"]["overall_quality"], evaluation["status"] == "PASS")
         return evaluation
     
+    def _record_score(self, score: float, passed: bool):
+        """Fold one evaluation into the running aggregates"""
+        self._count += 1
+        self._score_sum += score
+        if score < self._score_min:
+            self._score_min = score
+        if score > self._score_max:
+            self._score_max = score
+        if passed:
+            self._pass_count += 1
+    
     def evaluate_agent_collaboration(
         self,
         a2a_messages: List[Dict]
@@ -82,11 +114,13 @@ class AgentEvaluator:
             }
         
         # Analyze message flow
-        senders = set(msg["sender"] for msg in a2a_messages)
-        receivers = set(msg["receiver"] for msg in a2a_messages)
+        agents = set()
+        for msg in a2a_messages:
+            agents.add(msg["sender"])
+            agents.add(msg["receiver"])
         
         # Calculate collaboration metrics
-        agent_participation = len(senders.union(receivers))
+        agent_participation = len(agents)
         message_density = len(a2a_messages) / max(agent_participation, 1)
         
         collaboration_score = min(
@@ -102,54 +136,40 @@ class AgentEvaluator:
             "status": "PASS" if collaboration_score >= 70 else "NEEDS_IMPROVEMENT"
         }
     
-    def _get_grade(self, score: float) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_grade(score: float) -> str:
         """Convert score to letter grade"""
-        if score >= 95: return "A+"
-        if score >= 90: return "A"
-        if score >= 85: return "B+"
-        if score >= 80: return "B"
-        if score >= 75: return "C+"
-        if score >= 70: return "C"
-        return "F"
+        if score != score:  # NaN
+            return "F"
+        idx = bisect.bisect_left(_NEG_CUTOFFS, -score)
+        return _GRADE_LABELS[idx] if idx < len(_GRADE_LABELS) else "F"
     
     def generate_evaluation_report(self) -> Dict[str, Any]:
         """Generate comprehensive evaluation report"""
-        if not self.evaluation_history:
+        if not self._count:
             return {"status": "No evaluations performed"}
         
-        # Calculate aggregates
-        all_scores = [
-            e["metrics"]["overall_quality"] 
-            for e in self.evaluation_history
-        ]
+        count = self._count
+        avg_quality = self._score_sum / count
         
         return {
-            "total_evaluations": len(self.evaluation_history),
-            "average_score": round(sum(all_scores) / len(all_scores), 2),
-            "highest_score": round(max(all_scores), 2),
-            "lowest_score": round(min(all_scores), 2),
-            "pass_rate": round(
-                sum(1 for e in self.evaluation_history if e["status"] == "PASS") 
-                / len(self.evaluation_history) * 100, 2
-            ),
-            "benchmark_comparison": self._compare_to_benchmarks(),
+            "total_evaluations": count,
+            "average_score": round(avg_quality, 2),
+            "highest_score": round(self._score_max, 2),
+            "lowest_score": round(self._score_min, 2),
+            "pass_rate": round(self._pass_count / count * 100, 2),
+            "benchmark_comparison": self._compare_to_benchmarks(avg_quality),
             "recent_evaluations": self.evaluation_history[-5:]
         }
     
-    def _compare_to_benchmarks(self) -> Dict[str, str]:
-        """Compare performance against benchmarks"""
-        if not self.evaluation_history:
-            return {}
-        
-        avg_quality = sum(
-            e["metrics"]["overall_quality"] 
-            for e in self.evaluation_history
-        ) / len(self.evaluation_history)
-        
+    def _compare_to_benchmarks(self, avg_quality: float) -> Dict[str, str]:
+        """Compare average quality score against benchmarks"""
+        target = self.BENCHMARKS["prediction_accuracy"] * 100
         return {
-            "vs_target_85": "EXCEEDS" if avg_quality >= 85 else "BELOW",
+            "vs_target_85": "EXCEEDS" if avg_quality >= target else "BELOW",
             "performance_level": self._get_grade(avg_quality),
-            "improvement_needed": max(0, 85 - avg_quality)
+            "improvement_needed": max(0, target - avg_quality)
         }
 
 # Global instance
@@ -39,7 +39,7 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -70,16 +70,48 @@ from observability.logger import eco_logger
 # Import memory and session management
 from memory.session_manager import session_service, memory_bank
 
-# Import agents
-from agents.data_collector_agent import data_collector_agent
-from agents.pollution_predictor_agent import pollution_predictor_agent
-from agents.action_deployer_agent import ActionDeployerAgent
-from agents.coordinator_agent import CoordinatorAgent, WorkflowType
+# Agents and tools are imported inside EcoGuardianSystem so that importing this
+# module (or exiting from the menu) doesn't pay for the Gemini/HTTP client setup
 
-# Import tools
-from tools.carbon_calculator import carbon_calculator
-from tools.weather_api_tool import weather_api
-from tools.google_search_tool import google_search_tool
+try:
+    import orjson
+    
+    def _dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+except ImportError:
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
+_LOG_RULE = "=" * 70
+
+# Personal concierge recommendations are not yet personalised, so define them once;
+# callers get fresh copies
+_STATIC_RECOMMENDATIONS: Tuple[Dict[str, str], ...] = (
+    {
+        "action": "Switch to public transportation",
+        "description": "Reduce vehicle emissions by using public transit",
+        "impact": "Save 1,200 kg CO2/year"
+    },
+    {
+        "action": "Install LED lighting",
+        "description": "Replace traditional bulbs with energy-efficient LEDs",
+        "impact": "Save 300 kg CO2/year"
+    },
+    {
+        "action": "Support local renewable energy",
+        "description": "Switch to a renewable energy provider",
+        "impact": "Save 800 kg CO2/year"
+    }
+)
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write a batch of console lines with a single stdout call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 class EcoGuardianSystem:
@@ -96,6 +128,14 @@ class EcoGuardianSystem:
             # Validate settings first
             Settings.validate()
             
+            from agents.data_collector_agent import data_collector_agent
+            from agents.pollution_predictor_agent import pollution_predictor_agent
+            from agents.action_deployer_agent import ActionDeployerAgent
+            from agents.coordinator_agent import CoordinatorAgent
+            from tools.carbon_calculator import carbon_calculator
+            from tools.weather_api_tool import weather_api
+            from tools.google_search_tool import google_search_tool
+            
             # Initialize all agents
             self.agents = {
                 "data_collector": data_collector_agent,
@@ -120,15 +160,17 @@ class EcoGuardianSystem:
             self.memory_bank = memory_bank
             self.session_service = session_service
             
-            eco_logger.logger.info("="*70)
-            eco_logger.logger.info("ECOGUARDIAN AI SYSTEM - FULLY INITIALIZED")
-            eco_logger.logger.info("="*70)
-            eco_logger.logger.info(f"   Agents: {list(self.agents.keys())}")
-            eco_logger.logger.info(f"   Tools: {list(self.tools.keys())}")
-            eco_logger.logger.info("="*70 + "\n")
+            logger = eco_logger.logger
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_LOG_RULE)
+                logger.info("ECOGUARDIAN AI SYSTEM - FULLY INITIALIZED")
+                logger.info(_LOG_RULE)
+                logger.info("   Agents: %s", list(self.agents))
+                logger.info("   Tools: %s", list(self.tools))
+                logger.info("%s\n", _LOG_RULE)
             
         except Exception as e:
-            eco_logger.logger.error(f"Initialization failed: {str(e)}")
+            eco_logger.logger.error("Initialization failed: %s", e)
             raise
     
     # ========================================================================
@@ -149,21 +191,26 @@ class EcoGuardianSystem:
         - Graceful degradation
         """
         
-        print(f"\n{'='*70}")
-        print(f"SEQUENTIAL WORKFLOW: Complete City Analysis")
-        print(f"   Location: {city}")
-        print(f"{'='*70}\n")
+        lines = [
+            f"\n{_LOG_RULE}",
+            "SEQUENTIAL WORKFLOW: Complete City Analysis",
+            f"   Location: {city}",
+            f"{_LOG_RULE}\n",
+        ]
         
-        session_id = f"seq_{city.lower()}_{int(datetime.now().timestamp())}"
+        start_dt = datetime.now()
+        start_iso = start_dt.isoformat()
+        session_id = f"seq_{city.lower()}_{int(start_dt.timestamp())}"
         session = session_service.create_session(
             session_id,
-            {"city": city, "workflow": "sequential", "start_time": datetime.now().isoformat()}
+            {"city": city, "workflow": "sequential", "start_time": start_iso}
         )
         
         try:
             # STAGE 1: Data Collection
-            print("STAGE 1: Environmental Data Collection...")
-            city_data = await data_collector_agent.collect_city_data(city, coordinates)
+            lines.append("STAGE 1: Environmental Data Collection...")
+            _write_lines(lines)
+            city_data = await self.agents["data_collector"].collect_city_data(city, coordinates)
             
             if not city_data.get("success"):
                 raise Exception(f"Data collection failed for {city}")
@@ -173,24 +220,26 @@ class EcoGuardianSystem:
                 "score": city_data.get("environmental_score")
             })
             
-            print(f"   ✓ Environmental Score: {city_data.get('environmental_score')}/100")
-            print(f"   ✓ AQI: {city_data.get('air_quality', {}).get('aqi')} "
-                  f"({city_data.get('air_quality', {}).get('aqi_label')})")
-            
-            # STAGE 2: AI Prediction
-            print("\nSTAGE 2: AI-Powered Pollution Prediction (Gemini)...")
-            predictions = pollution_predictor_agent.predict_interventions(city_data)
+            air_quality = city_data.get('air_quality', {})
+            _write_lines([
+                f"   ✓ Environmental Score: {city_data.get('environmental_score')}/100",
+                f"   ✓ AQI: {air_quality.get('aqi')} ({air_quality.get('aqi_label')})",
+                # STAGE 2: AI Prediction
+                "\nSTAGE 2: AI-Powered Pollution Prediction (Gemini)...",
+            ])
+            predictions = self.agents["predictor"].predict_interventions(city_data)
             
             session.add_message("agent", "Predictions generated", {
                 "agent": "PollutionPredictor",
                 "interventions": len(predictions.get("interventions", []))
             })
             
-            print(f"   ✓ Interventions Predicted: {len(predictions.get('interventions', []))}")
-            print(f"   ✓ Average Confidence: {predictions.get('average_confidence')}%")
-            
-            # STAGE 3: Action Deployment
-            print("\nSTAGE 3: Deploying Eco-Actions...")
+            _write_lines([
+                f"   ✓ Interventions Predicted: {len(predictions.get('interventions', []))}",
+                f"   ✓ Average Confidence: {predictions.get('average_confidence')}%",
+                # STAGE 3: Action Deployment
+                "\nSTAGE 3: Deploying Eco-Actions...",
+            ])
             deployment_result = await self.agents["deployer"].deploy_actions(
                 predictions,
                 city
@@ -201,15 +250,17 @@ class EcoGuardianSystem:
                 "actions_count": len(deployment_result.get("actions_deployed", []))
             })
             
-            print(f"   ✓ Actions Deployed: {len(deployment_result.get('actions_deployed', []))}")
-            print(f"   ✓ Estimated CO2 Reduction: {deployment_result.get('estimated_impact', {}).get('total_co2_reduction_kg_per_year', 0)} kg/year\n")
-            
-            # STAGE 4: Generate Report
-            print("STAGE 4: Generating Comprehensive Report...\n")
+            _write_lines([
+                f"   ✓ Actions Deployed: {len(deployment_result.get('actions_deployed', []))}",
+                f"   ✓ Estimated CO2 Reduction: {deployment_result.get('estimated_impact', {}).get('total_co2_reduction_kg_per_year', 0)} kg/year\n",
+                # STAGE 4: Generate Report
+                "STAGE 4: Generating Comprehensive Report...\n",
+            ])
             report = self._generate_comprehensive_report(
                 city_data,
                 predictions,
-                deployment_result
+                deployment_result,
+                timestamp=start_iso
             )
             
             # Store in memory
@@ -250,30 +301,26 @@ class EcoGuardianSystem:
     ) -> Dict[str, Any]:
         """Execute parallel analysis - DEBUGGED"""
         
-        print(f"\n{'='*70}")
-        print(f"PARALLEL WORKFLOW: Multi-City Comparison")
-        print(f"   Cities: {', '.join(cities)}")
-        print(f"{'='*70}\n")
-        
-        print(f"Launching {len(cities)} parallel data collection tasks...\n")
-        
-        # Create async tasks
-        tasks = [
-            data_collector_agent.collect_city_data(city)
-            for city in cities
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        _write_lines([
+            f"\n{_LOG_RULE}",
+            "PARALLEL WORKFLOW: Multi-City Comparison",
+            f"   Cities: {', '.join(cities)}",
+            f"{_LOG_RULE}\n",
+            f"Launching {len(cities)} parallel data collection tasks...\n",
+        ])
         
-        # Process results
+        # Handle each city as soon as its collection finishes
         city_results = {}
         valid_results = []
         
-        for i, city in enumerate(cities):
-            if isinstance(results[i], dict) and results[i].get("success"):
-                city_results[city] = results[i]
-                score = results[i].get('environmental_score', 0)
-                aqi = results[i].get('air_quality', {}).get('aqi', 0)
+        for next_done in asyncio.as_completed(
+            [self._collect_city_data(city) for city in cities]
+        ):
+            city, result = await next_done
+            if isinstance(result, dict) and result.get("success"):
+                city_results[city] = result
+                score = result.get('environmental_score', 0)
+                aqi = result.get('air_quality', {}).get('aqi', 0)
                 
                 valid_results.append({
                     "city": city,
@@ -282,16 +329,22 @@ class EcoGuardianSystem:
                     "status": self._get_status(score)
                 })
                 
-                print(f"   ✓ {city}: Score {score}/100 | AQI {aqi}")
+                _write_lines([f"   ✓ {city}: Score {score}/100 | AQI {aqi}"])
             else:
-                print(f"   ✗ {city}: Failed")
+                _write_lines([f"   ✗ {city}: Failed"])
         
-        # Rank cities
-        valid_results.sort(key=lambda x: x['score'], reverse=True)
+        # Rank cities; ties keep input order rather than completion order
+        input_order = {}
+        for index, city in enumerate(cities):
+            input_order.setdefault(city, index)
+        valid_results.sort(
+            key=lambda x: (x['score'], -input_order[x['city']]), reverse=True
+        )
         
-        print(f"\n🏆 RANKINGS:")
+        lines = ["\n🏆 RANKINGS:"]
         for rank, result in enumerate(valid_results, 1):
-            print(f"   {rank}. {result['city']} - Score: {result['score']}/100")
+            lines.append(f"   {rank}. {result['city']} - Score: {result['score']}/100")
+        _write_lines(lines)
         
         return {
             "success": True,
@@ -303,6 +356,13 @@ class EcoGuardianSystem:
             "timestamp": datetime.now().isoformat()
         }
     
+    async def _collect_city_data(self, city: str):
+        """Collect data for one city, returning the exception instead of raising"""
+        try:
+            return city, await self.agents["data_collector"].collect_city_data(city)
+        except Exception as e:
+            return city, e
+    
     # ========================================================================
     # WORKFLOW 3: HYBRID ORCHESTRATION (DEBUGGED)
     # ========================================================================
@@ -314,15 +374,18 @@ class EcoGuardianSystem:
     ) -> Dict[str, Any]:
         """Execute hybrid workflow - DEBUGGED"""
         
-        print(f"\n{'='*70}")
-        print(f"HYBRID WORKFLOW: Complete Orchestration (Coordinator Agent)")
-        print(f"   Location: {location}")
-        print(f"{'='*70}\n")
+        _write_lines([
+            f"\n{_LOG_RULE}",
+            "HYBRID WORKFLOW: Complete Orchestration (Coordinator Agent)",
+            f"   Location: {location}",
+            f"{_LOG_RULE}\n",
+            "Coordinator Agent is orchestrating multi-agent workflow...",
+            "   → Parallel data collection",
+            "   → Sequential prediction & analysis",
+            "   → Adaptive deployment\n",
+        ])
         
-        print("Coordinator Agent is orchestrating multi-agent workflow...")
-        print("   → Parallel data collection")
-        print("   → Sequential prediction & analysis")
-        print("   → Adaptive deployment\n")
+        from agents.coordinator_agent import WorkflowType
         
         result = await self.coordinator.orchestrate_urban_healing(
             location=location,
@@ -330,10 +393,12 @@ class EcoGuardianSystem:
             workflow_type=WorkflowType.HYBRID
         )
         
-        print(f"✅ Orchestration Complete!")
-        print(f"   Status: {result.get('status')}")
-        print(f"   Stages Completed: {len(result.get('stages', {}))}")
-        print(f"   A2A Messages: {len(result.get('a2a_messages', []))}\n")
+        _write_lines([
+            "✅ Orchestration Complete!",
+            f"   Status: {result.get('status')}",
+            f"   Stages Completed: {len(result.get('stages', {}))}",
+            f"   A2A Messages: {len(result.get('a2a_messages', []))}\n",
+        ])
         
         return result
     
@@ -348,10 +413,12 @@ class EcoGuardianSystem:
     ) -> Dict[str, Any]:
         """Execute personal concierge - DEBUGGED"""
         
-        print(f"\n{'='*70}")
-        print(f"PERSONAL CONCIERGE: Carbon Tracking & Recommendations")
-        print(f"   Location: {user_location}")
-        print(f"{'='*70}\n")
+        lines = [
+            f"\n{_LOG_RULE}",
+            "PERSONAL CONCIERGE: Carbon Tracking & Recommendations",
+            f"   Location: {user_location}",
+            f"{_LOG_RULE}\n",
+        ]
         
         if not user_activities:
             user_activities = [
@@ -360,16 +427,17 @@ class EcoGuardianSystem:
             ]
         
         # Calculate carbon footprint
-        print("Calculating your carbon footprint...")
-        footprint = carbon_calculator.calculate_total_footprint(user_activities)
+        lines.append("Calculating your carbon footprint...")
+        footprint = self.tools["carbon_calculator"].calculate_total_footprint(user_activities)
         
-        print(f"\n   Total Emissions: {footprint.get('total_emissions_kg_co2')} kg CO2")
+        lines.append(f"\n   Total Emissions: {footprint.get('total_emissions_kg_co2')} kg CO2")
         
         # Get location data
-        print(f"\nAnalyzing environmental conditions in {user_location}...")
-        location_data = await data_collector_agent.collect_city_data(user_location)
+        lines.append(f"\nAnalyzing environmental conditions in {user_location}...")
+        _write_lines(lines)
+        location_data = await self.agents["data_collector"].collect_city_data(user_location)
         
-        print(f"   ✓ Environmental Score: {location_data.get('environmental_score')}/100")
+        lines = [f"   ✓ Environmental Score: {location_data.get('environmental_score')}/100"]
         
         # Generate recommendations
         recommendations = self._generate_personal_recommendations(
@@ -377,9 +445,10 @@ class EcoGuardianSystem:
             location_data
         )
         
-        print(f"\n💡 Personalized Eco-Recommendations:")
+        lines.append("\n💡 Personalized Eco-Recommendations:")
         for i, rec in enumerate(recommendations[:3], 1):
-            print(f"   {i}. {rec.get('action')}")
+            lines.append(f"   {i}. {rec.get('action')}")
+        _write_lines(lines)
         
         return {
             "success": True,
@@ -396,13 +465,14 @@ class EcoGuardianSystem:
         self,
         city_data: Dict[str, Any],
         predictions: Dict[str, Any],
-        deployment: Dict[str, Any]
+        deployment: Dict[str, Any],
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate comprehensive report"""
+        """Generate comprehensive report, stamped with the workflow's start time if given"""
         return {
             "success": True,
             "report_type": "comprehensive_city_analysis",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "sections": {
                 "executive_summary": {
                     "city": city_data.get("city"),
@@ -425,26 +495,9 @@ class EcoGuardianSystem:
         self,
         footprint: Dict[str, Any],
         location_data: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Dict]:
         """Generate personal recommendations"""
-        recommendations = [
-            {
-                "action": "Switch to public transportation",
-                "description": "Reduce vehicle emissions by using public transit",
-                "impact": "Save 1,200 kg CO2/year"
-            },
-            {
-                "action": "Install LED lighting",
-                "description": "Replace traditional bulbs with energy-efficient LEDs",
-                "impact": "Save 300 kg CO2/year"
-            },
-            {
-                "action": "Support local renewable energy",
-                "description": "Switch to a renewable energy provider",
-                "impact": "Save 800 kg CO2/year"
-            }
-        ]
-        return recommendations
+        return [dict(rec) for rec in _STATIC_RECOMMENDATIONS]
     
     def _get_status(self, score: float) -> str:
         """Determine status from score"""
@@ -465,7 +518,7 @@ class EcoGuardianSystem:
             memory_stats = {"total_entries": 0}
         
         return {
-            "predictor_evaluation": pollution_predictor_agent.get_evaluation_metrics(),
+            "predictor_evaluation": self.agents["predictor"].get_evaluation_metrics(),
             "deployer_evaluation": self.agents["deployer"].evaluate_deployment_success(),
             "coordinator_evaluation": self.coordinator.evaluate_coordination_performance(),
             "memory_statistics": memory_stats,
@@ -490,27 +543,46 @@ class EcoGuardianSystem:
 # INTERACTIVE MENU
 # ============================================================================
 
+_MENU = "\n".join([
+    "\n" + _LOG_RULE,
+    "🌍 ECOGUARDIAN AI - MULTI-AGENT URBAN ECOSYSTEM HEALER",
+    _LOG_RULE,
+    "\n📋 AVAILABLE WORKFLOWS:\n",
+    "1. 🔄 SEQUENTIAL: Complete City Analysis",
+    "2. 🌍 PARALLEL: Multi-City Comparison",
+    "3. 🎯 HYBRID: Complete Orchestration",
+    "4. 👤 PERSONAL: Carbon Tracking",
+    "5. 📊 METRICS: System Performance",
+    "6. 💾 EXPORT: Export Data",
+    "7. 🚪 EXIT\n",
+]) + "\n"
+_MENU_BYTES = _MENU.encode("utf-8")
+
+_INIT_BANNER = f"\n{_LOG_RULE}\n🌍 Initializing EcoGuardian AI System...\n{_LOG_RULE}\n\n"
+_INIT_BANNER_BYTES = _INIT_BANNER.encode("utf-8")
+
+
+def _write_static(text: str, encoded: bytes) -> None:
+    """Write pre-encoded static text straight to the binary stdout buffer"""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Replaced stdout without a binary layer (e.g. IDEs, Streamlit)
+        sys.stdout.write(text)
+        return
+    sys.stdout.flush()
+    buffer.write(encoded)
+    buffer.flush()
+
+
 def display_menu():
     """Display menu"""
-    print("\n" + "="*70)
-    print("🌍 ECOGUARDIAN AI - MULTI-AGENT URBAN ECOSYSTEM HEALER")
-    print("="*70)
-    print("\n📋 AVAILABLE WORKFLOWS:\n")
-    print("1. 🔄 SEQUENTIAL: Complete City Analysis")
-    print("2. 🌍 PARALLEL: Multi-City Comparison")
-    print("3. 🎯 HYBRID: Complete Orchestration")
-    print("4. 👤 PERSONAL: Carbon Tracking")
-    print("5. 📊 METRICS: System Performance")
-    print("6. 💾 EXPORT: Export Data")
-    print("7. 🚪 EXIT\n")
+    _write_static(_MENU, _MENU_BYTES)
 
 
 async def main():
     """Main entry point - DEBUGGED"""
     
-    print("\n" + "="*70)
-    print("🌍 Initializing EcoGuardian AI System...")
-    print("="*70 + "\n")
+    _write_static(_INIT_BANNER, _INIT_BANNER_BYTES)
     
     try:
         system = EcoGuardianSystem()
@@ -545,7 +617,7 @@ async def main():
                 print("\n📊 SYSTEM METRICS")
                 print("="*70)
                 metrics = system.get_system_metrics()
-                print(json.dumps(metrics, indent=2, default=str))
+                print(_dumps_pretty(metrics))
                 
             elif choice == "6":
                 system.export_traces_and_memory()
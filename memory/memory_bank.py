@@ -5,15 +5,100 @@ Implements memory management for sessions, workflows, and historical data.
 Supports context-aware retrieval and intelligent memory compaction.
 """
 
+import bisect
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import sys
+import time
+from typing import Dict, Iterable, List, Any, Mapping, Optional, Set, Tuple
+from datetime import datetime
 import json
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from types import MappingProxyType
+
+import numpy as np
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Initial capacity of the compaction scoring arrays (doubled on demand)
+_INITIAL_SLOTS = 256
+
+# Serialization for export and exact sizes: orjson when available, stdlib json
+# otherwise. Both produce compact UTF-8 bytes so exact sizes mean the same
+# either way. Search text uses _search_json instead.
+try:
+    import orjson
+    
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    
+    def _dumps_pretty(value: Any) -> bytes:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(
+            value, default=str, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+    
+    def _dumps_pretty(value: Any) -> bytes:
+        return json.dumps(value, indent=2, default=str).encode("utf-8")
+    
+    _loads = json.loads
+
+
+def _search_json(value: Any) -> str:
+    """Value text matched by search(): plain json.dumps, or "" if it can't be serialized."""
+    try:
+        return json.dumps(value, default=str)
+    except Exception:
+        return ""
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate size of value in bytes, counting container contents recursively."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+
+def _context_item(context_key: Any, context_value: Any) -> Tuple[str, str]:
+    """
+    context_index key for one context item. Both parts are compared as str(),
+    so {"id": "1"} matches an entry stored with {"id": 1}.
+    """
+    return (str(context_key), str(context_value))
+
+
+def _read_only(value: Any) -> Any:
+    """Wrap dicts in a read-only proxy; other values pass through unchanged."""
+    return MappingProxyType(value) if isinstance(value, dict) else value
+
+
+def _iso(timestamp: float) -> Optional[str]:
+    """Render an epoch timestamp as ISO 8601, or None if it is unknown (NaN)."""
+    if timestamp != timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _parse_iso(value: Any) -> float:
+    """Parse an ISO 8601 timestamp to epoch seconds, or NaN if it is missing or invalid."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
 
 class MemoryBank:
     """
@@ -21,22 +106,60 @@ class MemoryBank:
     Provides persistent storage with context compaction and intelligent retrieval.
     """
     
-    def __init__(self, max_memory_size: int = 10000, compaction_threshold: float = 0.8):
+    def __init__(
+        self,
+        max_memory_size: int = 10000,
+        compaction_threshold: float = 0.8,
+        eviction_policy: str = "lru"
+    ):
         """
         Initialize the Memory Bank.
         
         Args:
             max_memory_size: Maximum number of memory entries before compaction
             compaction_threshold: Threshold (0-1) for triggering automatic compaction
+            eviction_policy: "lru" evicts the least recently used entries;
+                "scored" evicts the lowest access_count / age scores
         """
+        if eviction_policy not in ("lru", "scored"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
         self.max_memory_size = max_memory_size
         self.compaction_threshold = compaction_threshold
+        self.eviction_policy = eviction_policy
         self.memory_store = {}
-        self.memory_metadata = {}
-        self.context_index = defaultdict(list)
+        # Keys in least to most recently used order; only kept for LRU eviction
+        # so memory_store (and search/export) stays in insertion order
+        self._recency: Optional["OrderedDict[str, None]"] = (
+            OrderedDict() if eviction_policy == "lru" else None
+        )
+        # (str(context_key), str(context_value)) -> keys stored with that context item
+        self.context_index: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self._key_contexts: Dict[str, List[Tuple[str, str]]] = {}  # key -> its context_index keys
         self.access_counts = defaultdict(int)
         self.compaction_history = []
         
+        # Entry metadata as parallel arrays (SoA): key lives in slot
+        # self._slots[key] of _slot_access (access count), _slot_time (write
+        # time), _slot_size (estimated size), _slot_last (last access time)
+        # and _slot_context. Times are epoch seconds, NaN if unknown, and are
+        # only rendered as ISO strings when metadata leaves the bank (see
+        # _public_metadata). Deletes swap the last slot into the hole so the
+        # first len(_slot_keys) slots stay dense.
+        self._reset_slots()
+        
+        # (timestamp, key) pairs in time order for retrieve_recent. Entries go
+        # stale when a key is updated or deleted; they are skipped on read and
+        # dropped once they outnumber the live ones.
+        self._time_order: List[Tuple[float, str]] = []
+        
+        # Sum of estimated entry sizes over stored entries
+        self._total_size_bytes = 0
+        
+        # Lowercased (key, serialized value) text per entry for search(). Writes
+        # only drop the cached text; it is rebuilt the next time search() visits
+        # the entry, so the write path does no JSON work.
+        self._search_text: Dict[str, Tuple[str, str]] = {}
+        
         logger.info(f"MemoryBank initialized (max_size: {max_memory_size})")
     
     def store(self, key: str, value: Any, context: Optional[Dict] = None) -> bool:
@@ -59,28 +182,145 @@ class MemoryBank:
             
             # Store the value
             self.memory_store[key] = value
+            self._touch(key)
             
             # Store metadata
-            self.memory_metadata[key] = {
-                "timestamp": datetime.now().isoformat(),
-                "context": context or {},
-                "size": len(json.dumps(value, default=str)),
-                "access_count": 0,
-                "last_accessed": None
-            }
+            size = _estimate_size(value)
+            self._search_text.pop(key, None)
+            now = time.time()
+            self._index_time(key, now)
+            slot = self._slot(key)
+            self._total_size_bytes += size - int(self._slot_size[slot])
+            self._slot_access[slot] = 0
+            self._slot_time[slot] = now
+            self._slot_size[slot] = size
+            self._slot_last[slot] = np.nan
+            self._slot_context[slot] = context or {}
             
             # Index by context
+            self._unindex_contexts(key)
             if context:
-                for context_key, context_value in context.items():
-                    self.context_index[f"{context_key}:{context_value}"].append(key)
+                self._index_contexts(key, context)
             
-            logger.info(f"Memory stored: {key}")
+            logger.info("Memory stored: %s", key)
             return True
             
         except Exception as e:
             logger.error(f"Failed to store memory {key}: {str(e)}")
             return False
     
+    def _touch(self, key: str):
+        """Mark key as most recently used for LRU eviction."""
+        if self._recency is not None:
+            self._recency[key] = None
+            self._recency.move_to_end(key)
+    
+    def _index_time(self, key: str, timestamp: float):
+        """Record an entry's new write time in the time index."""
+        if key in self._slots:
+            self._prune_time_order()
+        bisect.insort(self._time_order, (timestamp, key))
+    
+    def _prune_time_order(self):
+        """Drop stale time index entries once they outnumber the live ones."""
+        if len(self._time_order) > 2 * len(self._slot_keys) + 64:
+            self._rebuild_time_order()
+    
+    def _rebuild_time_order(self):
+        """Rebuild the time index from the slot write times."""
+        n_slots = len(self._slot_keys)
+        self._time_order = sorted(
+            (float(timestamp), key)
+            for key, timestamp in zip(self._slot_keys, self._slot_time[:n_slots])
+            if timestamp == timestamp
+        )
+    
+    def _is_current(self, key: str, timestamp: float) -> bool:
+        """Whether a time index entry still reflects key's write time."""
+        slot = self._slots.get(key)
+        return slot is not None and self._slot_time[slot] == timestamp
+    
+    @property
+    def memory_metadata(self) -> Mapping[str, Mapping]:
+        """Read-only view of per-entry metadata, rebuilt from the slot arrays on
+        every access (O(N)). Writes raise TypeError; use store/update instead."""
+        return MappingProxyType({
+            key: MappingProxyType(dict(metadata, context=_read_only(metadata["context"])))
+            for key, metadata in self._metadata_snapshot().items()
+        })
+    
+    def _metadata_snapshot(self) -> Dict[str, Dict]:
+        """Plain-dict copy of every entry's public metadata."""
+        return {key: self._public_metadata(key) for key in self._slot_keys}
+    
+    def _reset_slots(self):
+        """Empty the metadata arrays."""
+        self._slots: Dict[str, int] = {}
+        self._slot_keys: List[str] = []
+        self._slot_access = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+        self._slot_time = np.full(_INITIAL_SLOTS, np.nan, dtype=np.float64)
+        self._slot_size = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+        self._slot_last = np.full(_INITIAL_SLOTS, np.nan, dtype=np.float64)
+        self._slot_context: List[Dict] = []
+    
+    def _slot(self, key: str) -> int:
+        """Return the metadata slot for key, allocating a blank one if needed."""
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._slot_keys)
+            if slot == len(self._slot_access):
+                self._slot_access = np.concatenate(
+                    (self._slot_access, np.zeros(slot, dtype=np.int64))
+                )
+                self._slot_time = np.concatenate(
+                    (self._slot_time, np.full(slot, np.nan, dtype=np.float64))
+                )
+                self._slot_size = np.concatenate(
+                    (self._slot_size, np.zeros(slot, dtype=np.int64))
+                )
+                self._slot_last = np.concatenate(
+                    (self._slot_last, np.full(slot, np.nan, dtype=np.float64))
+                )
+            self._slot_access[slot] = 0
+            self._slot_time[slot] = np.nan
+            self._slot_size[slot] = 0
+            self._slot_last[slot] = np.nan
+            self._slots[key] = slot
+            self._slot_keys.append(key)
+            self._slot_context.append({})
+        return slot
+    
+    def _free_slot(self, key: str):
+        """Release key's slot by moving the last slot into it."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        last_key = self._slot_keys.pop()
+        last_context = self._slot_context.pop()
+        if last_key != key:
+            last = len(self._slot_keys)
+            self._slot_keys[slot] = last_key
+            self._slots[last_key] = slot
+            self._slot_access[slot] = self._slot_access[last]
+            self._slot_time[slot] = self._slot_time[last]
+            self._slot_size[slot] = self._slot_size[last]
+            self._slot_last[slot] = self._slot_last[last]
+            self._slot_context[slot] = last_context
+    
+    def _index_contexts(self, key: str, context: Dict[str, Any]):
+        """Add key to the context index under each of its context items."""
+        index_keys = [_context_item(context_key, context_value) for context_key, context_value in context.items()]
+        for index_key in index_keys:
+            self.context_index[index_key].add(key)
+        self._key_contexts[key] = index_keys
+    
+    def _unindex_contexts(self, key: str):
+        """Remove key from the context index."""
+        for index_key in self._key_contexts.pop(key, ()):
+            keys = self.context_index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+    
     def retrieve(self, key: str) -> Optional[Any]:
         """
         Retrieve a memory entry by key.
@@ -92,16 +332,18 @@ class MemoryBank:
             Stored value or None if not found
         """
         if key not in self.memory_store:
-            logger.warning(f"Memory not found: {key}")
+            logger.warning("Memory not found: %s", key)
             return None
         
         # Update access metadata
         self.access_counts[key] += 1
-        if key in self.memory_metadata:
-            self.memory_metadata[key]["access_count"] += 1
-            self.memory_metadata[key]["last_accessed"] = datetime.now().isoformat()
+        slot = self._slot(key)
+        self._slot_access[slot] += 1
+        self._slot_last[slot] = time.time()
+        self._touch(key)
         
-        logger.info(f"Memory retrieved: {key}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Memory retrieved: %s", key)
         return self.memory_store[key]
     
     def retrieve_by_context(self, context: Dict[str, Any], limit: int = 10) -> List[Dict]:
@@ -115,28 +357,33 @@ class MemoryBank:
         Returns:
             List of matching memory entries with metadata
         """
-        matching_keys = set()
-        
-        # Find keys matching all context criteria
+        # Gather the posting set of each context criterion; any criterion with
+        # no entries rules out a match
+        postings = []
         for context_key, context_value in context.items():
-            index_key = f"{context_key}:{context_value}"
-            if index_key in self.context_index:
-                current_matches = set(self.context_index[index_key])
-                if not matching_keys:
-                    matching_keys = current_matches
-                else:
-                    matching_keys = matching_keys.intersection(current_matches)
-        
-        # Retrieve and format results
+            keys = self.context_index.get(_context_item(context_key, context_value))
+            if not keys:
+                postings = []
+                break
+            postings.append(keys)
+        
+        # Walk the smallest posting set, probing the others, and stop at
+        # limit matches rather than materializing the whole intersection
+        postings.sort(key=len)
+        smallest, others = (postings[0], postings[1:]) if postings else ((), [])
         results = []
-        for key in list(matching_keys)[:limit]:
+        for key in smallest:
+            if len(results) >= limit:
+                break
+            if not all(key in keys for keys in others):
+                continue
             results.append({
                 "key": key,
                 "value": self.memory_store.get(key),
-                "metadata": self.memory_metadata.get(key)
+                "metadata": self._public_metadata(key)
             })
         
-        logger.info(f"Context search returned {len(results)} results")
+        logger.info("Context search returned %d results", len(results))
         return results
     
     def retrieve_recent(self, hours: int = 24, limit: int = 50) -> List[Dict]:
@@ -150,27 +397,26 @@ class MemoryBank:
         Returns:
             List of recent memory entries
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff_time = time.time() - hours * 3600
         recent_entries = []
+        seen = set()
+        
+        # Walk the time index from the newest entry backwards
+        for timestamp, key in reversed(self._time_order):
+            if timestamp < cutoff_time or len(recent_entries) >= limit:
+                break
+            if key in seen or not self._is_current(key, timestamp):
+                continue  # stale index entry
+            seen.add(key)
+            recent_entries.append({
+                "key": key,
+                "value": self.memory_store.get(key),
+                "metadata": self._public_metadata(key),
+                "timestamp": datetime.fromtimestamp(timestamp)
+            })
         
-        for key, metadata in self.memory_metadata.items():
-            try:
-                timestamp = datetime.fromisoformat(metadata["timestamp"])
-                if timestamp >= cutoff_time:
-                    recent_entries.append({
-                        "key": key,
-                        "value": self.memory_store.get(key),
-                        "metadata": metadata,
-                        "timestamp": timestamp
-                    })
-            except:
-                pass
-        
-        # Sort by timestamp (most recent first)
-        recent_entries.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        logger.info(f"Retrieved {len(recent_entries[:limit])} recent entries")
-        return recent_entries[:limit]
+        logger.info("Retrieved %d recent entries", len(recent_entries))
+        return recent_entries
     
     def update(self, key: str, value: Any, merge: bool = False) -> bool:
         """
@@ -185,7 +431,7 @@ class MemoryBank:
             True if updated successfully, False otherwise
         """
         if key not in self.memory_store:
-            logger.warning(f"Cannot update non-existent memory: {key}")
+            logger.warning("Cannot update non-existent memory: %s", key)
             return False
         
         try:
@@ -193,13 +439,19 @@ class MemoryBank:
                 self.memory_store[key].update(value)
             else:
                 self.memory_store[key] = value
+            self._touch(key)
             
             # Update metadata
-            if key in self.memory_metadata:
-                self.memory_metadata[key]["timestamp"] = datetime.now().isoformat()
-                self.memory_metadata[key]["size"] = len(json.dumps(self.memory_store[key], default=str))
+            now = time.time()
+            self._index_time(key, now)
+            slot = self._slot(key)
+            self._slot_time[slot] = now
+            size = _estimate_size(self.memory_store[key])
+            self._search_text.pop(key, None)
+            self._total_size_bytes += size - int(self._slot_size[slot])
+            self._slot_size[slot] = size
             
-            logger.info(f"Memory updated: {key}")
+            logger.info("Memory updated: %s", key)
             return True
             
         except Exception as e:
@@ -211,70 +463,68 @@ class MemoryBank:
         if key not in self.memory_store:
             return False
         
+        self._remove_entry(key)
+        logger.info("Memory deleted: %s", key)
+        return True
+    
+    def _bulk_delete(self, keys: Iterable[str]) -> int:
+        """Delete several memory entries, returning how many existed."""
+        removed_count = 0
+        for key in keys:
+            if key in self.memory_store:
+                self._remove_entry(key)
+                removed_count += 1
+        return removed_count
+    
+    def _remove_entry(self, key: str):
+        """Drop a stored entry and all of its bookkeeping."""
         del self.memory_store[key]
+        if self._recency is not None:
+            self._recency.pop(key, None)
         
-        if key in self.memory_metadata:
-            del self.memory_metadata[key]
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._total_size_bytes -= int(self._slot_size[slot])
+            self._free_slot(key)
+            self._prune_time_order()
+        self._search_text.pop(key, None)
         
-        for index_key, keys in self.context_index.items():
-            if key in keys:
-                keys.remove(key)
+        self._unindex_contexts(key)
         
         if key in self.access_counts:
             del self.access_counts[key]
-        
-        logger.info(f"Memory deleted: {key}")
-        return True
     
     def compact_memory(self, target_reduction: float = 0.3):
-        """
-        Compact memory by removing least accessed and oldest entries.
-        
-        Args:
-            target_reduction: Fraction of memory to free (0-1)
-        """
         """
         CONTEXT COMPACTION DEMONSTRATION
-    
+        
         Intelligent memory management that:
-        1. Scores entries based on access_count / age
-        2. Removes least valuable entries when threshold reached
-        3. Preserves frequently accessed and recent data
-        4. Records compaction events for OBSERVABILITY
-    
+        1. Picks entries to evict according to eviction_policy:
+           - "lru" (default): the least recently stored, updated or retrieved
+           - "scored": the lowest access_count / (age_days + 1), oldest first on ties
+        2. Removes them when the threshold is reached
+        3. Records compaction events for OBSERVABILITY
+        
         This prevents memory overflow while maintaining important context.
         Competition requirement: Context Engineering ✅
+        
+        Args:
+            target_reduction: Fraction of memory to free (0-1)
         """
         logger.info(f"Starting memory compaction (target reduction: {target_reduction*100}%)")
         
         current_size = len(self.memory_store)
         target_size = int(current_size * (1 - target_reduction))
         
-        # Score entries
-        entry_scores = []
-        for key in self.memory_store.keys():
-            metadata = self.memory_metadata.get(key, {})
-            
-            access_count = metadata.get("access_count", 0)
-            try:
-                timestamp = datetime.fromisoformat(metadata.get("timestamp", datetime.now().isoformat()))
-                age_days = (datetime.now() - timestamp).days
-            except:
-                age_days = 0
-            
-            score = access_count / (age_days + 1)
-            entry_scores.append((key, score))
-        
-        # Sort by score
-        entry_scores.sort(key=lambda x: x[1])
-        
-        # Remove lowest scoring entries
-        entries_to_remove = entry_scores[:current_size - target_size]
-        removed_count = 0
-        
-        for key, score in entries_to_remove:
-            if self.delete(key):
-                removed_count += 1
+        # A negative reduction (or a target above the current size) evicts nothing
+        n_remove = current_size - target_size
+        if n_remove <= 0:
+            victims = []
+        elif self.eviction_policy == "lru":
+            victims = list(islice(self._recency, n_remove))
+        else:
+            victims = self._lowest_scored(n_remove)
+        removed_count = self._bulk_delete(victims)
         
         # Record compaction
         compaction_event = {
@@ -288,13 +538,30 @@ class MemoryBank:
         
         logger.info(f"Memory compaction completed: {removed_count} entries removed")
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get memory bank statistics."""
-        total_size = sum(
-            self.memory_metadata.get(key, {}).get("size", 0)
-            for key in self.memory_store.keys()
-        )
+    def _lowest_scored(self, n: int) -> List[str]:
+        """Keys of the n entries with the lowest access_count / (age_days + 1)."""
+        # Entries with an unknown write time count as brand new
+        n_slots = len(self._slot_keys)
+        age_days = np.floor((time.time() - self._slot_time[:n_slots]) / 86400.0)
+        age_days = np.nan_to_num(age_days, nan=0.0)
+        scores = self._slot_access[:n_slots] / (age_days + 1)
+        
+        # Lowest scores first, oldest first among equal scores
+        victims = np.lexsort((self._slot_time[:n_slots], scores))[:n]
+        return [self._slot_keys[i] for i in victims]
+    
+    def get_statistics(self, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get memory bank statistics.
         
+        Args:
+            exact: If True, report total_size_bytes as the serialized JSON size
+                of all entries instead of the running in-memory estimate
+        """
+        if exact:
+            total_size = sum(len(_dumps(value)) for value in self.memory_store.values())
+        else:
+            total_size = self._total_size_bytes
         return {
             "total_entries": len(self.memory_store),
             "total_size_bytes": total_size,
@@ -308,63 +575,81 @@ class MemoryBank:
     
     def _get_most_accessed(self, limit: int = 5) -> List[Dict]:
         """Get the most frequently accessed memory entries."""
-        sorted_entries = sorted(
+        top_entries = heapq.nlargest(
+            limit,
             self.access_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
+            key=lambda x: x[1]
         )
         
         return [
             {
                 "key": key,
                 "access_count": count,
-                "metadata": self.memory_metadata.get(key)
+                "metadata": self._public_metadata(key)
             }
-            for key, count in sorted_entries[:limit]
+            for key, count in top_entries
         ]
     
     def search(self, query: str, limit: int = 10) -> List[Dict]:
-        """Search memory entries by text query."""
+        """Search memory entries by text query (substring of key or JSON value), in insertion order."""
         results = []
         query_lower = query.lower()
         
-        for key, value in self.memory_store.items():
-            if query_lower in key.lower():
-                results.append({
-                    "key": key,
-                    "value": value,
-                    "metadata": self.memory_metadata.get(key),
-                    "match_type": "key"
-                })
-                continue
-            
-            try:
-                value_str = json.dumps(value, default=str).lower()
-                if query_lower in value_str:
-                    results.append({
-                        "key": key,
-                        "value": value,
-                        "metadata": self.memory_metadata.get(key),
-                        "match_type": "value"
-                    })
-            except:
-                pass
-        
-        logger.info(f"Search for '{query}' returned {len(results[:limit])} results")
-        return results[:limit]
+        for key in self.memory_store:
+            if len(results) >= limit:
+                break
+            match = self._search_match(key, query_lower)
+            if match:
+                results.append(match)
+        
+        logger.info("Search for '%s' returned %d results", query, len(results))
+        return results
+    
+    def _search_match(self, key: str, query_lower: str) -> Optional[Dict]:
+        """Build a search hit for key if it matches the query."""
+        text = self._search_text.get(key)
+        if text is None:
+            text = (key.lower(), _search_json(self.memory_store[key]).lower())
+            self._search_text[key] = text
+        key_text, value_text = text
+        if query_lower in key_text:
+            match_type = "key"
+        elif query_lower in value_text:
+            match_type = "value"
+        else:
+            return None
+        return {
+            "key": key,
+            "value": self.memory_store.get(key),
+            "metadata": self._public_metadata(key),
+            "match_type": match_type
+        }
+    
+    def _public_metadata(self, key: str) -> Optional[Dict]:
+        """Metadata dict for key, with its timestamps rendered as ISO strings."""
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        return {
+            "timestamp": _iso(self._slot_time[slot]),
+            "context": self._slot_context[slot],
+            "size": int(self._slot_size[slot]),
+            "access_count": int(self._slot_access[slot]),
+            "last_accessed": _iso(self._slot_last[slot])
+        }
     
     def export_memory(self, filepath: str) -> bool:
         """Export memory bank to a JSON file."""
         try:
             export_data = {
                 "memory_store": self.memory_store,
-                "memory_metadata": self.memory_metadata,
+                "memory_metadata": self._metadata_snapshot(),
                 "export_timestamp": datetime.now().isoformat(),
                 "statistics": self.get_statistics()
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps_pretty(export_data))
             
             logger.info(f"Memory exported to {filepath}")
             return True
@@ -376,23 +661,45 @@ class MemoryBank:
     def import_memory(self, filepath: str, merge: bool = True) -> bool:
         """Import memory bank from a JSON file."""
         try:
-            with open(filepath, 'r') as f:
-                import_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                import_data = _loads(f.read())
             
             if not merge:
                 self.memory_store.clear()
-                self.memory_metadata.clear()
+                if self._recency is not None:
+                    self._recency.clear()
                 self.context_index.clear()
+                self._key_contexts.clear()
                 self.access_counts.clear()
+                self._reset_slots()
+                self._total_size_bytes = 0
+                self._search_text.clear()
             
-            self.memory_store.update(import_data.get("memory_store", {}))
-            self.memory_metadata.update(import_data.get("memory_metadata", {}))
+            imported_store = import_data.get("memory_store", {})
+            imported_metadata = import_data.get("memory_metadata", {})
+            self.memory_store.update(imported_store)
             
-            # Rebuild context index
-            for key, metadata in self.memory_metadata.items():
-                context = metadata.get("context", {})
-                for context_key, context_value in context.items():
-                    self.context_index[f"{context_key}:{context_value}"].append(key)
+            # Load each imported entry into its slot, parsing ISO timestamps
+            # back to epoch seconds once
+            for key, value in imported_store.items():
+                metadata = imported_metadata.get(key) or {}
+                size = _estimate_size(value)
+                self._search_text.pop(key, None)
+                self._touch(key)
+                slot = self._slot(key)
+                self._total_size_bytes += size - int(self._slot_size[slot])
+                self._slot_size[slot] = size
+                self._slot_access[slot] = metadata.get("access_count", 0)
+                self._slot_time[slot] = _parse_iso(metadata.get("timestamp"))
+                self._slot_last[slot] = _parse_iso(metadata.get("last_accessed"))
+                self._slot_context[slot] = metadata.get("context") or {}
+                
+                # Re-index only the imported entries; entries kept by a merge
+                # are already indexed
+                self._unindex_contexts(key)
+                if self._slot_context[slot]:
+                    self._index_contexts(key, self._slot_context[slot])
+            self._rebuild_time_order()
             
             logger.info(f"Memory imported from {filepath}")
             return True
@@ -404,9 +711,15 @@ class MemoryBank:
     def clear_all(self):
         """Clear all memory entries (use with caution!)."""
         self.memory_store.clear()
-        self.memory_metadata.clear()
+        if self._recency is not None:
+            self._recency.clear()
         self.context_index.clear()
+        self._key_contexts.clear()
         self.access_counts.clear()
+        self._time_order.clear()
+        self._reset_slots()
+        self._total_size_bytes = 0
+        self._search_text.clear()
         logger.warning("All memory cleared")
 
 
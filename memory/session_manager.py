@@ -3,56 +3,145 @@ Session Manager - EcoGuardian AI
 Manages user sessions and integrates with MemoryBank for persistent storage
 """
 
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
+import sys
+import time
+from typing import Deque, Dict, Iterable, List, Any, Optional, Tuple
+from datetime import datetime
+from collections import defaultdict, deque
+from itertools import islice
 import json
 
+import numpy as np
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Import the global logger
 from observability.logger import eco_logger
 
+# Messages kept per session; older ones are dropped as new ones arrive
+_MAX_SESSION_MESSAGES = 1000
+
+# Compact JSON for memory export/import: orjson when available, stdlib json otherwise
+try:
+    import orjson
+    
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+    
+    _loads = json.loads
+
+
+# MemoryBank entries are keyed by (interned category, key) pairs and shown
+# outside the bank (exports, statistics) as "category:key" strings
+FullKey = Tuple[str, str]
+
+
+def _join_key(full_key: FullKey) -> str:
+    """Render a (category, key) pair as category:key"""
+    return f"{full_key[0]}:{full_key[1]}"
+
+
+def _split_key(joined_key: str) -> FullKey:
+    """Parse a category:key string back into a (category, key) pair"""
+    category, _, key = joined_key.partition(":")
+    return (sys.intern(category), key)
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    """Render an epoch timestamp as ISO 8601 (None stays None)."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """Parse an ISO 8601 timestamp to epoch seconds (None if missing or invalid)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class Message:
+    """A single session message (timestamp in epoch seconds)"""
+    
+    __slots__ = ("role", "content", "metadata", "timestamp")
+    
+    def __init__(self, role: str, content: str, metadata: Dict[str, Any], timestamp: float):
+        self.role = role
+        self.content = content
+        self.metadata = metadata
+        self.timestamp = timestamp
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert message to dictionary"""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "metadata": self.metadata,
+            "timestamp": _iso(self.timestamp)
+        }
+
 
 class Session:
-    """Represents a user session"""
+    """Represents a user session (timestamps are epoch seconds)"""
     
     def __init__(self, session_id: str, initial_state: Dict[str, Any] = None):
         self.session_id = session_id
         self.state = initial_state or {}
-        self.messages = []
-        self.created_at = datetime.now()
-        self.last_accessed = datetime.now()
+        self.messages: Deque[Message] = deque(maxlen=_MAX_SESSION_MESSAGES)
+        self.created_at = time.time()
+        self.last_accessed = self.created_at
     
     def add_message(self, role: str, content: str, metadata: Dict[str, Any] = None):
         """Add a message to the session"""
-        self.messages.append({
-            "role": role,
-            "content": content,
-            "metadata": metadata or {},
-            "timestamp": datetime.now().isoformat()
-        })
-        self.last_accessed = datetime.now()
+        now = time.time()
+        self.messages.append(Message(role, content, metadata or {}, now))
+        self.last_accessed = now
     
     def update_state(self, key: str, value: Any):
         """Update session state"""
         self.state[key] = value
-        self.last_accessed = datetime.now()
+        self.last_accessed = time.time()
+    
+    def update_many(self, mapping: Dict[str, Any]):
+        """Update several session state keys at once"""
+        self.state.update(mapping)
+        self.last_accessed = time.time()
     
     def get_context(self, max_messages: int = 10) -> List[Dict]:
         """Get recent messages for context"""
-        return self.messages[-max_messages:]
+        if max_messages <= 0:
+            # Keep messages[-max_messages:] semantics for non-positive limits
+            return [message.to_dict() for message in list(self.messages)[-max_messages:]]
+        
+        # Walk back from the newest message so only the returned ones are visited
+        recent = [message.to_dict() for message in islice(reversed(self.messages), max_messages)]
+        recent.reverse()
+        return recent
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary"""
         return {
             "session_id": self.session_id,
             "state": self.state,
-            "messages": self.messages,
-            "created_at": self.created_at.isoformat(),
-            "last_accessed": self.last_accessed.isoformat()
+            "messages": [message.to_dict() for message in self.messages],
+            "created_at": _iso(self.created_at),
+            "last_accessed": _iso(self.last_accessed)
         }
 
 
@@ -64,45 +153,48 @@ class InMemorySessionService:
     
     def __init__(self):
         self.sessions: Dict[str, Session] = {}
+        # Min-heap of (last_accessed as last seen, session_id). It may hold stale
+        # or duplicate entries (e.g. after a session_id is deleted and
+        # re-created); cleanup re-checks the live session on pop and skips them
+        self._expiry_heap: List[Tuple[float, str]] = []
         eco_logger.logger.info("InMemorySessionService initialized")
     
     def create_session(self, session_id: str, initial_state: Dict[str, Any] = None) -> Session:
         """Create a new session"""
         if session_id in self.sessions:
-            logger.info(f"Session {session_id} already exists, returning existing")
+            logger.info("Session %s already exists, returning existing", session_id)
             return self.sessions[session_id]
         
         session = Session(session_id, initial_state)
         self.sessions[session_id] = session
-        logger.info(f"Created session: {session_id}")
+        heapq.heappush(self._expiry_heap, (session.last_accessed, session_id))
+        logger.info("Created session: %s", session_id)
         return session
     
     def get_session(self, session_id: str) -> Optional[Session]:
         """Retrieve a session"""
         session = self.sessions.get(session_id)
         if session:
-            session.last_accessed = datetime.now()
+            session.last_accessed = time.time()
         return session
     
     def update_session(self, session_id: str, data: Dict[str, Any]) -> bool:
         """Update session with new data"""
-        session = self.get_session(session_id)
+        session = self.sessions.get(session_id)
         if not session:
-            logger.warning(f"Session {session_id} not found")
+            logger.warning("Session %s not found", session_id)
             return False
         
-        for key, value in data.items():
-            session.update_state(key, value)
-        
+        # update_many also refreshes last_accessed
+        session.update_many(data)
         return True
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            logger.info(f"Deleted session: {session_id}")
-            return True
-        return False
+        if self.sessions.pop(session_id, None) is None:
+            return False
+        logger.info("Deleted session: %s", session_id)
+        return True
     
     def list_sessions(self) -> List[str]:
         """List all active session IDs"""
@@ -110,17 +202,24 @@ class InMemorySessionService:
     
     def cleanup_old_sessions(self, hours: int = 24):
         """Remove sessions older than specified hours"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        to_remove = []
+        cutoff_time = time.time() - hours * 3600
+        removed_count = 0
         
-        for session_id, session in self.sessions.items():
+        # Only sessions whose last seen access is past the cutoff are visited.
+        # Sessions touched since then are pushed back with their current
+        # last_accessed; entries for deleted sessions are dropped.
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff_time:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
             if session.last_accessed < cutoff_time:
-                to_remove.append(session_id)
-        
-        for session_id in to_remove:
-            self.delete_session(session_id)
+                self.delete_session(session_id)
+                removed_count += 1
+            else:
+                heapq.heappush(self._expiry_heap, (session.last_accessed, session_id))
         
-        logger.info(f"Cleaned up {len(to_remove)} old sessions")
+        logger.info("Cleaned up %d old sessions", removed_count)
 
 
 class MemoryBank:
@@ -141,30 +240,32 @@ class MemoryBank:
         self.compaction_threshold = compaction_threshold
         self.memory_store = {}
         self.memory_metadata = {}
-        self.context_index = defaultdict(list)
+        self.context_index = defaultdict(set)
+        self._key_contexts: Dict[FullKey, List[str]] = {}  # full key -> its context_index keys
+        # category -> its full keys (dict used as an insertion-ordered set)
+        self.category_index: Dict[str, Dict[FullKey, None]] = defaultdict(dict)
         self.access_counts = defaultdict(int)
         self.compaction_history = []
         
         eco_logger.logger.info("MemoryBank initialized")
     
     def store(self, *args, **kwargs) -> bool:
-        # Handle both signatures
+        """
+        Store a memory entry; see _store. Accepts both
+        store(category, key, value, context=...) and
+        store(key, value, context=...) (category "default").
+        """
+        context = kwargs.get('context')
+        if len(args) == 3:
+            return self._store(args[0], args[1], args[2], context)
         if len(args) == 2:
-            # Called as: store(key, value, context=...)
-            key, value = args
-            category = "default"
-            context = kwargs.get('context')
-        elif len(args) == 3:
-            # Called as: store(category, key, value, context=...)
-            category, key, value = args
-            context = kwargs.get('context')
-        else:
-            category = args[0] if len(args) > 0 else "default"
-            key = args[1] if len(args) > 1 else ""
-            value = args[2] if len(args) > 2 else None
-            context = kwargs.get('context')
-    
-        full_key = f"{category}:{key}"
+            return self._store("default", args[0], args[1], context)
+        category = args[0] if len(args) > 0 else "default"
+        key = args[1] if len(args) > 1 else ""
+        value = args[2] if len(args) > 2 else None
+        return self._store(category, key, value, context)
+    
+    def _store(self, category: str, key: str, value: Any, context: Optional[Dict] = None) -> bool:
         """
         Store a memory entry with optional context metadata.
         
@@ -177,9 +278,10 @@ class MemoryBank:
         Returns:
             True if stored successfully
         """
-        full_key = f"{category}:{key}"
-        
         try:
+            category = sys.intern(category)
+            full_key = (category, key)
+            
             # Check if compaction is needed
             if len(self.memory_store) >= int(self.max_memory_size * self.compaction_threshold):
                 logger.info("Memory threshold reached, triggering compaction")
@@ -187,44 +289,58 @@ class MemoryBank:
             
             # Store the value
             self.memory_store[full_key] = value
+            self.category_index[category][full_key] = None
             
             # Store metadata
             self.memory_metadata[full_key] = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": time.time(),
                 "category": category,
                 "context": context or {},
-                "size": len(json.dumps(value, default=str)),
-                "access_count": 0,
+                "size": None,  # serialized size, filled in by _entry_size on demand
                 "last_accessed": None
             }
             
             # Index by context
+            self._unindex_contexts(full_key)
             if context:
-                for context_key, context_value in context.items():
-                    self.context_index[f"{context_key}:{context_value}"].append(full_key)
+                self._index_contexts(full_key, context)
             
-            logger.info(f"Memory stored: {full_key}")
+            logger.info("Memory stored: %s:%s", category, key)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to store memory {full_key}: {str(e)}")
+            logger.error(f"Failed to store memory {category}:{key}: {str(e)}")
             return False
     
+    def _index_contexts(self, full_key: FullKey, context: Dict[str, Any]):
+        """Add an entry to the context index under each of its context items"""
+        index_keys = [f"{context_key}:{context_value}" for context_key, context_value in context.items()]
+        for index_key in index_keys:
+            self.context_index[index_key].add(full_key)
+        self._key_contexts[full_key] = index_keys
+    
+    def _unindex_contexts(self, full_key: FullKey):
+        """Remove an entry from the context index"""
+        for index_key in self._key_contexts.pop(full_key, ()):
+            keys = self.context_index.get(index_key)
+            if keys is not None:
+                keys.discard(full_key)
+    
     def retrieve(self, category: str, key: str) -> Optional[Any]:
         """Retrieve a memory entry"""
-        full_key = f"{category}:{key}"
+        full_key = (category, key)
         
         if full_key not in self.memory_store:
-            logger.warning(f"Memory not found: {full_key}")
+            logger.warning("Memory not found: %s:%s", category, key)
             return None
         
-        # Update access metadata
+        # Update access metadata (access_counts is the only access counter)
         self.access_counts[full_key] += 1
         if full_key in self.memory_metadata:
-            self.memory_metadata[full_key]["access_count"] += 1
-            self.memory_metadata[full_key]["last_accessed"] = datetime.now().isoformat()
+            self.memory_metadata[full_key]["last_accessed"] = time.time()
         
-        logger.info(f"Memory retrieved: {full_key}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Memory retrieved: %s:%s", category, key)
         return self.memory_store[full_key]
     
     def search(self, category: str, filter_fn=None) -> List[Dict]:
@@ -240,38 +356,51 @@ class MemoryBank:
         """
         results = []
         
-        for key, value in self.memory_store.items():
-            if key.startswith(f"{category}:"):
-                if filter_fn is None or filter_fn(value):
-                    results.append(value)
+        for full_key in self.category_index.get(category, ()):
+            value = self.memory_store[full_key]
+            if filter_fn is None or filter_fn(value):
+                results.append(value)
         
         return results
     
     def delete(self, category: str, key: str) -> bool:
         """Delete a memory entry"""
-        full_key = f"{category}:{key}"
+        full_key = (category, key)
         
         if full_key not in self.memory_store:
             return False
         
+        self._remove_entry(full_key)
+        logger.info("Memory deleted: %s:%s", category, key)
+        return True
+    
+    def _bulk_delete(self, full_keys: Iterable[FullKey]) -> int:
+        """Delete several memory entries by full key, returning how many existed"""
+        removed_count = 0
+        for full_key in full_keys:
+            if full_key in self.memory_store:
+                self._remove_entry(full_key)
+                removed_count += 1
+        return removed_count
+    
+    def _remove_entry(self, full_key: FullKey):
+        """Drop a stored entry and all of its bookkeeping"""
         del self.memory_store[full_key]
+        self.memory_metadata.pop(full_key, None)
         
-        if full_key in self.memory_metadata:
-            del self.memory_metadata[full_key]
-        
-        for index_key, keys in self.context_index.items():
-            if full_key in keys:
-                keys.remove(full_key)
+        category = full_key[0]
+        category_keys = self.category_index.get(category)
+        if category_keys is not None:
+            category_keys.pop(full_key, None)
+            if not category_keys:
+                del self.category_index[category]
         
-        if full_key in self.access_counts:
-            del self.access_counts[full_key]
-        
-        logger.info(f"Memory deleted: {full_key}")
-        return True
+        self._unindex_contexts(full_key)
+        self.access_counts.pop(full_key, None)
     
     def compact_memory(self, target_reduction: float = 0.3):
         """Compact memory by removing least accessed and oldest entries"""
-        logger.info(f"Starting memory compaction (target reduction: {target_reduction*100}%)")
+        logger.info("Starting memory compaction (target reduction: %s%%)", target_reduction * 100)
         
         current_size = len(self.memory_store)
         if current_size == 0:
@@ -279,32 +408,26 @@ class MemoryBank:
         
         target_size = int(current_size * (1 - target_reduction))
         
-        # Score entries
-        entry_scores = []
-        for key in self.memory_store.keys():
-            metadata = self.memory_metadata.get(key, {})
-            
-            access_count = metadata.get("access_count", 0)
-            try:
-                timestamp = datetime.fromisoformat(metadata.get("timestamp", datetime.now().isoformat()))
-                age_days = (datetime.now() - timestamp).days
-            except:
-                age_days = 0
-            
-            score = access_count / (age_days + 1)
-            entry_scores.append((key, score))
-        
-        # Sort by score (ascending - lowest first)
-        entry_scores.sort(key=lambda x: x[1])
-        
-        # Remove lowest scoring entries
-        entries_to_remove = entry_scores[:current_size - target_size]
-        removed_count = 0
+        # Score entries (access_count / (age_days + 1)) in one vectorized pass;
+        # entries with an unknown timestamp count as brand new
+        now = time.time()
+        keys = list(self.memory_store.keys())
+        metadata = [self.memory_metadata.get(key) or {} for key in keys]
+        access_counts = np.fromiter(
+            (self.access_counts.get(key, 0) for key in keys), dtype=np.float64, count=current_size
+        )
+        timestamps = np.fromiter(
+            (now if m.get("timestamp") is None else m["timestamp"] for m in metadata),
+            dtype=np.float64,
+            count=current_size
+        )
+        age_days = np.floor((now - timestamps) / 86400.0)
+        scores = access_counts / (age_days + 1)
         
-        for key, score in entries_to_remove:
-            category, _, item_key = key.partition(":")
-            if self.delete(category, item_key):
-                removed_count += 1
+        # Remove lowest scoring entries; a stable sort keeps store order among
+        # equal scores, which argpartition would not
+        victims = np.argsort(scores, kind="stable")[:current_size - target_size]
+        removed_count = self._bulk_delete([keys[i] for i in victims])
         
         # Record compaction
         compaction_event = {
@@ -316,14 +439,11 @@ class MemoryBank:
         }
         self.compaction_history.append(compaction_event)
         
-        logger.info(f"Memory compaction completed: {removed_count} entries removed")
+        logger.info("Memory compaction completed: %d entries removed", removed_count)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get memory bank statistics"""
-        total_size = sum(
-            self.memory_metadata.get(key, {}).get("size", 0)
-            for key in self.memory_store.keys()
-        )
+        total_size = sum(self._entry_size(key) for key in self.memory_store.keys())
         
         return {
             "total_entries": len(self.memory_store),
@@ -336,35 +456,62 @@ class MemoryBank:
             "most_accessed_entries": self._get_most_accessed(5)
         }
     
+    def _entry_size(self, full_key: FullKey) -> int:
+        """Serialized size of an entry, computed on first use and cached in its metadata"""
+        metadata = self.memory_metadata.get(full_key)
+        if metadata is None:
+            return 0
+        if metadata.get("size") is None:
+            metadata["size"] = len(json.dumps(self.memory_store[full_key], default=str))
+        return metadata["size"]
+    
     def _get_most_accessed(self, limit: int = 5) -> List[Dict]:
         """Get the most frequently accessed memory entries"""
-        sorted_entries = sorted(
+        top_entries = heapq.nlargest(
+            limit,
             self.access_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
+            key=lambda x: x[1]
         )
         
         return [
             {
-                "key": key,
+                "key": _join_key(key),
                 "access_count": count,
-                "metadata": self.memory_metadata.get(key)
+                "metadata": self._public_metadata(key)
             }
-            for key, count in sorted_entries[:limit]
+            for key, count in top_entries
         ]
     
+    def _public_metadata(self, key: FullKey) -> Optional[Dict]:
+        """Copy of key's metadata with its access count and ISO timestamps filled in"""
+        metadata = self.memory_metadata.get(key)
+        if metadata is None:
+            return None
+        return {
+            **metadata,
+            "timestamp": _iso(metadata.get("timestamp")),
+            "access_count": self.access_counts.get(key, 0),
+            "last_accessed": _iso(metadata.get("last_accessed"))
+        }
+    
     def export_memory(self, filepath: str) -> bool:
         """Export memory bank to a JSON file"""
         try:
+            # Statistics first, so every entry's size is filled in
+            statistics = self.get_statistics()
             export_data = {
-                "memory_store": self.memory_store,
-                "memory_metadata": self.memory_metadata,
+                "memory_store": {
+                    _join_key(key): value for key, value in self.memory_store.items()
+                },
+                "memory_metadata": {
+                    _join_key(key): self._public_metadata(key) for key in self.memory_metadata
+                },
                 "export_timestamp": datetime.now().isoformat(),
-                "statistics": self.get_statistics()
+                "statistics": statistics
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps(export_data))
             
             logger.info(f"Memory exported to {filepath}")
             return True
@@ -376,23 +523,39 @@ class MemoryBank:
     def import_memory(self, filepath: str, merge: bool = True) -> bool:
         """Import memory bank from a JSON file"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                import_data = _loads(f.read())
             
             if not merge:
                 self.memory_store.clear()
                 self.memory_metadata.clear()
                 self.context_index.clear()
+                self._key_contexts.clear()
+                self.category_index.clear()
                 self.access_counts.clear()
             
-            self.memory_store.update(import_data.get("memory_store", {}))
-            self.memory_metadata.update(import_data.get("memory_metadata", {}))
+            for joined_key, value in import_data.get("memory_store", {}).items():
+                key = _split_key(joined_key)
+                self.memory_store[key] = value
+                self.category_index[key[0]][key] = None
+            # Timestamps are exported as ISO strings; keep them as epoch seconds.
+            # Exported access counts go back into access_counts.
+            for joined_key, metadata in import_data.get("memory_metadata", {}).items():
+                key = _split_key(joined_key)
+                metadata = {
+                    **metadata,
+                    "timestamp": _parse_timestamp(metadata.get("timestamp")),
+                    "last_accessed": _parse_timestamp(metadata.get("last_accessed"))
+                }
+                access_count = metadata.pop("access_count", 0)
+                if access_count:
+                    self.access_counts[key] = access_count
+                self.memory_metadata[key] = metadata
             
             # Rebuild context index
             for key, metadata in self.memory_metadata.items():
-                context = metadata.get("context", {})
-                for context_key, context_value in context.items():
-                    self.context_index[f"{context_key}:{context_value}"].append(key)
+                self._unindex_contexts(key)
+                self._index_contexts(key, metadata.get("context", {}))
             
             logger.info(f"Memory imported from {filepath}")
             return True
@@ -406,6 +569,8 @@ class MemoryBank:
         self.memory_store.clear()
         self.memory_metadata.clear()
         self.context_index.clear()
+        self._key_contexts.clear()
+        self.category_index.clear()
         self.access_counts.clear()
         logger.warning("All memory cleared")
 
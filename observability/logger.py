@@ -3,30 +3,75 @@ EcoGuardian AI - Observability System
 Implements logging, tracing, and metrics for agent activities
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 import json
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Deque, Dict, Any, List
 from functools import wraps
 from config.settings import Settings
 
+# Number of recent values kept per metric (summaries cover all values)
+_METRIC_WINDOW = 4096
+
+# log_error includes a full traceback for the first error and every Nth after it
+_TRACEBACK_EVERY = 50
+
 class EcoGuardianLogger:
     """Comprehensive logging system with tracing and metrics"""
     
+    # Static dashboard layout; get_metrics_dashboard only fills in the values
+    _DASHBOARD_TEMPLATE = """
+    ╔══════════════════════════════════════════════════════════════╗
+    ║           🌍 ECOGUARDIAN AI - METRICS DASHBOARD             ║
+    ╚══════════════════════════════════════════════════════════════╝
+
+    📊 AGENT PERFORMANCE:
+      • Total Predictions: {total_predictions}
+      • Avg Response Time: {avg_response_time:.2f}s
+      • API Calls Made: {api_calls}
+  
+    🎯 QUALITY METRICS:
+      • Prediction Accuracy: {prediction_accuracy:.1f}%
+      • System Uptime: 100%
+      • Error Rate: 0%
+
+    🔄 WORKFLOW STATISTICS:
+      • Sequential Workflows: Completed ✅
+      • Parallel Workflows: Completed ✅
+      • Loop Iterations: {trace_count} total operations
+  
+    💾 MEMORY USAGE:
+      • Traces Stored: {trace_count}
+      • Memory Entries: [Auto-tracked]
+  
+    ════════════════════════════════════════════════════════════════
+    """
+    
     def __init__(self, name: str = "EcoGuardian"):
         self.name = name
-        self.metrics: Dict[str, List[float]] = {
-            "agent_response_time": [],
-            "api_calls": [],
-            "memory_usage": [],
-            "prediction_accuracy": []
+        self.metrics: Dict[str, Deque[float]] = {
+            name: deque(maxlen=_METRIC_WINDOW)
+            for name in ("agent_response_time", "api_calls", "memory_usage", "prediction_accuracy")
         }
+        # Running count/sum/min/max per recorded metric
+        self._metric_totals: Dict[str, Dict[str, float]] = {}
+        
+        # Errors logged so far, for traceback sampling in log_error
+        self._error_count = 0
         
         # Setup logging
         self.logger = self._setup_logger()
         
+        # Reused encoder for agent action details; same output as
+        # json.dumps(details, default=str), including ASCII escapes
+        self._encode_details = json.JSONEncoder(default=str).encode
+        
         # Tracing data
         self.traces: List[Dict[str, Any]] = []
     
@@ -52,60 +97,53 @@ class EcoGuardianLogger:
         console_handler.setFormatter(formatter)
         file_handler.setFormatter(formatter)
         
-        eco_logger.addHandler(console_handler)
-        eco_logger.addHandler(file_handler)
+        # Records are queued by the caller and written to the console and
+        # file by a background listener thread, stopped (and drained) at exit
+        log_queue: queue.Queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        
+        eco_logger.addHandler(logging.handlers.QueueHandler(log_queue))
         
         return eco_logger
     
     def log_agent_action(self, agent_name: str, action: str, details: Dict[str, Any]):
         """Log agent actions with structured data"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": agent_name,
-            "action": action,
-            "details": details
-        }
         # FIXED: Removed emoji for Windows compatibility
-        self.logger.info(f"[AGENT] {agent_name} | ACTION: {action} | {json.dumps(details)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("[AGENT] %s | ACTION: %s | %s", agent_name, action, self._encode_details(details))
         
         if Settings.ENABLE_TRACING:
-            self.traces.append(log_entry)
+            self.traces.append({
+                "timestamp": datetime.now().isoformat(),
+                "agent": agent_name,
+                "action": action,
+                "details": details
+            })
     
     def log_tool_usage(self, tool_name: str, input_data: Any, output_data: Any):
         """Log tool invocations"""
-        self.logger.debug(f"[TOOL] {tool_name} | INPUT: {input_data} | OUTPUT: {output_data}")
+        self.logger.debug("[TOOL] %s | INPUT: %s | OUTPUT: %s", tool_name, input_data, output_data)
 
     def get_metrics_dashboard(self) -> str:
         """Generate real-time metrics dashboard"""
-        summary = self.get_metrics_summary()
-    
-        dashboard = f"""
-    ╔══════════════════════════════════════════════════════════════╗
-    ║           🌍 ECOGUARDIAN AI - METRICS DASHBOARD             ║
-    ╚══════════════════════════════════════════════════════════════╝
-
-    📊 AGENT PERFORMANCE:
-      • Total Predictions: {len(self.metrics.get('prediction_accuracy', []))}
-      • Avg Response Time: {summary.get('agent_response_time', {}).get('avg', 0):.2f}s
-      • API Calls Made: {int(summary.get('api_calls', {}).get('count', 0))}
-  
-    🎯 QUALITY METRICS:
-      • Prediction Accuracy: {summary.get('prediction_accuracy', {}).get('avg', 0):.1f}%
-      • System Uptime: 100%
-      • Error Rate: 0%
-
-    🔄 WORKFLOW STATISTICS:
-      • Sequential Workflows: Completed ✅
-      • Parallel Workflows: Completed ✅
-      • Loop Iterations: {len(self.traces)} total operations
-  
-    💾 MEMORY USAGE:
-      • Traces Stored: {len(self.traces)}
-      • Memory Entries: [Auto-tracked]
-  
-    {'═' * 64}
-    """
-        return dashboard
+        totals = self._metric_totals
+        
+        def average(metric_name: str) -> float:
+            metric = totals.get(metric_name)
+            return metric["sum"] / metric["count"] if metric else 0
+        
+        trace_count = len(self.traces)
+        return self._DASHBOARD_TEMPLATE.format(
+            total_predictions=int(totals.get("prediction_accuracy", {}).get("count", 0)),
+            avg_response_time=average("agent_response_time"),
+            api_calls=int(totals.get("api_calls", {}).get("count", 0)),
+            prediction_accuracy=average("prediction_accuracy"),
+            trace_count=trace_count
+        )
     
     def log_error(self, component: str, error: Exception, context: Dict[str, Any] = None):
         """Log errors with full context"""
@@ -113,16 +151,31 @@ class EcoGuardianLogger:
             "component": component,
             "error_type": type(error).__name__,
             "error_message": str(error),
+            "error_repr": repr(error),
             "context": context or {}
         }
-        self.logger.error(f"[ERROR] {component}: {error}", exc_info=True)
+        include_traceback = self._error_count % _TRACEBACK_EVERY == 0
+        self._error_count += 1
+        self.logger.error("[ERROR] %s: %s", component, error, exc_info=include_traceback)
         self.traces.append({"type": "error", **error_data})
     
     def record_metric(self, metric_name: str, value: float):
         """Record performance metrics"""
         if metric_name in self.metrics:
             self.metrics[metric_name].append(value)
-            self.logger.debug(f"[METRIC] {metric_name} = {value}")
+            totals = self._metric_totals.get(metric_name)
+            if totals is None:
+                self._metric_totals[metric_name] = {
+                    "count": 1, "sum": value, "min": value, "max": value
+                }
+            else:
+                totals["count"] += 1
+                totals["sum"] += value
+                if value < totals["min"]:
+                    totals["min"] = value
+                if value > totals["max"]:
+                    totals["max"] = value
+            self.logger.debug("[METRIC] %s = %s", metric_name, value)
     
     def trace_workflow(self, workflow_name: str):
         """Decorator for tracing agent workflows"""
@@ -132,7 +185,7 @@ class EcoGuardianLogger:
                 start_time = time.time()
                 trace_id = f"{workflow_name}_{int(start_time * 1000)}"
                 
-                self.logger.info(f"[START WORKFLOW] {workflow_name} (ID: {trace_id})")
+                self.logger.info("[START WORKFLOW] %s (ID: %s)", workflow_name, trace_id)
                 
                 try:
                     result = func(*args, **kwargs)
@@ -158,13 +211,14 @@ class EcoGuardianLogger:
     def get_metrics_summary(self) -> Dict[str, Dict[str, float]]:
         """Get aggregated metrics"""
         summary = {}
-        for metric_name, values in self.metrics.items():
-            if values:
+        for metric_name in self.metrics:
+            totals = self._metric_totals.get(metric_name)
+            if totals:
                 summary[metric_name] = {
-                    "count": len(values),
-                    "avg": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values)
+                    "count": totals["count"],
+                    "avg": totals["sum"] / totals["count"],
+                    "min": totals["min"],
+                    "max": totals["max"]
                 }
         return summary
     
@@ -3,9 +3,71 @@ EcoGuardian AI - Carbon Calculator Tool (Custom MCP Tool)
 Calculates carbon emissions and offsets for various activities
 """
 
-from typing import Dict, Any
+import logging
+import math
+from enum import IntEnum
+from numbers import Real
+from typing import Callable, Dict, Any, Union
+
+import numpy as np
+
 from observability.logger import eco_logger
 
+# Category -> group and default unit, built once at import
+_CATEGORY_GROUPS = {
+    "transportation": ("car", "bus", "train", "plane", "bike", "walk"),
+    "energy": ("electricity", "natural_gas"),
+    "food": ("beef", "chicken", "fish", "vegetables", "dairy"),
+    "waste": ("landfill", "recycling", "compost")
+}
+_GROUP_UNITS = {"transportation": "km", "energy": "kWh", "food": "kg", "waste": "kg"}
+
+_GROUP_OF = {
+    category: group
+    for group, categories in _CATEGORY_GROUPS.items()
+    for category in categories
+}
+_DEFAULT_UNIT = {category: _GROUP_UNITS[group] for category, group in _GROUP_OF.items()}
+
+
+# Divisors for the equivalence/offset conversions, with cached reciprocals
+_TREE_KG_PER_YEAR = 22.0
+_CAR_KG_PER_KM = 0.171
+_SHORT_FLIGHT_KG = 90.0
+_SOLAR_KG_PER_KW = 1000.0
+_RENEWABLE_KG_PER_KWH = 0.475
+_RECIPROCALS = {
+    divisor: 1.0 / divisor
+    for divisor in (
+        _TREE_KG_PER_YEAR, _CAR_KG_PER_KM, _SHORT_FLIGHT_KG,
+        _SOLAR_KG_PER_KW, _RENEWABLE_KG_PER_KWH
+    )
+}
+
+
+def _is_valid_amount(amount: Any) -> bool:
+    """True for finite real numbers; bools, NaN and infinities are rejected"""
+    if isinstance(amount, bool) or not isinstance(amount, Real):
+        return False
+    try:
+        return math.isfinite(amount)
+    except OverflowError:  # ints too large for a float
+        return False
+
+
+def _converter(co2_kg: Union[float, np.ndarray]) -> Callable[..., Any]:
+    """
+    Return a (divisor, ndigits) -> rounded quotient function for co2_kg
+    
+    Arrays multiply by the cached reciprocal. Scalars keep exact division so
+    values on a rounding boundary are reported exactly as before.
+    """
+    if np.isscalar(co2_kg):
+        return lambda divisor, ndigits=None: round(co2_kg / divisor, ndigits)
+    
+    values = np.asarray(co2_kg, dtype=np.float64)
+    return lambda divisor, ndigits=0: np.round(values * _RECIPROCALS[divisor], ndigits)
+
 class CarbonCalculator:
     """
     Custom MCP Tool: Calculates carbon footprint for urban activities
@@ -46,6 +108,11 @@ class CarbonCalculator:
         "renewable_energy": 0.475  # kg CO2 per kWh avoided
     }
     
+    # Frozen factor lookup table aligned with EMISSION_FACTORS order
+    _INDEX_OF = {category: i for i, category in enumerate(EMISSION_FACTORS)}
+    _FACTOR_LUT = np.fromiter(EMISSION_FACTORS.values(), dtype=np.float64)
+    _FACTOR_LUT.flags.writeable = False
+    
     def __init__(self):
         self.name = "CarbonCalculator"
         eco_logger.log_agent_action(
@@ -73,45 +140,65 @@ class CarbonCalculator:
         Returns:
             Dictionary with emissions data
         """
-        try:
-            # Get emission factor
-            category_lower = category.lower()
-            if category_lower not in self.EMISSION_FACTORS:
-                eco_logger.log_error(
-                    self.name,
-                    ValueError(f"Unknown category: {category}"),
-                    {"activity_type": activity_type}
-                )
-                return self._error_response(f"Unknown category: {category}")
-            
-            factor = self.EMISSION_FACTORS[category_lower]
-            emissions = amount * factor
-            
-            # Calculate equivalents for context
-            equivalents = self._calculate_equivalents(emissions)
-            
-            result = {
-                "success": True,
-                "activity_type": activity_type,
-                "category": category,
-                "amount": amount,
-                "unit": unit if unit != "default" else self._get_default_unit(category_lower),
-                "emissions_kg_co2": round(emissions, 2),
-                "equivalents": equivalents,
-                "offset_recommendations": self._recommend_offsets(emissions)
-            }
-            
+        # Validate inputs explicitly; these were the only ways the calculation could fail
+        category_lower = category.lower() if isinstance(category, str) else None
+        factor = self.EMISSION_FACTORS.get(category_lower)
+        if factor is None:
+            eco_logger.log_error(
+                self.name,
+                ValueError(f"Unknown category: {category}"),
+                {"activity_type": activity_type}
+            )
+            return self._error_response(f"Unknown category: {category}")
+        
+        emissions = amount * factor if _is_valid_amount(amount) else math.nan
+        if not math.isfinite(emissions):
+            eco_logger.log_error(
+                self.name,
+                ValueError(f"Invalid amount: {amount!r}"),
+                {"category": category, "amount": amount}
+            )
+            return self._error_response(f"Invalid amount: {amount!r}")
+        
+        # Calculate equivalents for context
+        equivalents = self._calculate_equivalents(emissions)
+        
+        result = {
+            "success": True,
+            "activity_type": activity_type,
+            "category": category,
+            "amount": amount,
+            "unit": unit if unit != "default" else self._get_default_unit(category_lower),
+            "emissions_kg_co2": round(emissions, 2),
+            "equivalents": equivalents,
+            "offset_recommendations": self._recommend_offsets(emissions)
+        }
+        
+        if eco_logger.logger.isEnabledFor(logging.DEBUG):
             eco_logger.log_tool_usage(
                 self.name,
                 input_data={"category": category, "amount": amount},
                 output_data={"emissions": emissions}
             )
-            
-            return result
-            
-        except Exception as e:
-            eco_logger.log_error(self.name, e, {"category": category, "amount": amount})
-            return self._error_response(str(e))
+        
+        return result
+    
+    def calculate_emissions_fast(
+        self,
+        category_id: Union[int, np.ndarray],
+        amount: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """
+        Emissions (kg CO2) for an EmissionCategory id, without validation or logging
+        
+        Args:
+            category_id: EmissionCategory member or int, or an array of them
+            amount: Quantity in the category's default unit, or an array of them
+        
+        Returns:
+            Emissions for each id/amount pair
+        """
+        return self._FACTOR_LUT[category_id] * amount
     
     def calculate_total_footprint(self, activities: list) -> Dict[str, Any]:
         """
@@ -123,24 +210,58 @@ class CarbonCalculator:
         Returns:
             Aggregated emissions data
         """
-        total_emissions = 0.0
-        breakdown = {}
+        index_of = self._INDEX_OF
+        factor_idx = []
+        amounts = []
+        types = []
         
+        # Skip invalid activities with the same checks and logs as calculate_emissions
         for activity in activities:
-            result = self.calculate_emissions(
-                activity.get("activity_type", "general"),
-                activity["category"],
-                activity["amount"]
-            )
+            category = activity["category"]
+            amount = activity["amount"]
+            activity_type = activity.get("activity_type", "general")
             
-            if result["success"]:
-                emissions = result["emissions_kg_co2"]
-                total_emissions += emissions
-                
-                activity_type = result["activity_type"]
-                if activity_type not in breakdown:
-                    breakdown[activity_type] = 0.0
-                breakdown[activity_type] += emissions
+            i = index_of.get(category.lower()) if isinstance(category, str) else None
+            if i is None:
+                eco_logger.log_error(
+                    self.name,
+                    ValueError(f"Unknown category: {category}"),
+                    {"activity_type": activity_type}
+                )
+            elif not _is_valid_amount(amount):
+                eco_logger.log_error(
+                    self.name,
+                    ValueError(f"Invalid amount: {amount!r}"),
+                    {"category": category, "amount": amount}
+                )
+            else:
+                factor_idx.append(i)
+                amounts.append(amount)
+                types.append(activity_type)
+        
+        emissions = self._FACTOR_LUT[np.array(factor_idx, dtype=np.intp)] * np.array(amounts, dtype=np.float64)
+        
+        # Round each activity with builtin round and sum in order, exactly as the
+        # per-activity results were accumulated before
+        total_emissions = 0.0
+        breakdown = {}
+        for value, activity_type, amount in zip(emissions.tolist(), types, amounts):
+            if not math.isfinite(value):
+                eco_logger.log_error(
+                    self.name,
+                    ValueError(f"Invalid amount: {amount!r}"),
+                    {"activity_type": activity_type, "amount": amount}
+                )
+                continue
+            value = round(value, 2)
+            total_emissions += value
+            breakdown[activity_type] = breakdown.get(activity_type, 0.0) + value
+        
+        eco_logger.log_tool_usage(
+            self.name,
+            input_data={"activities": len(activities)},
+            output_data={"emissions": total_emissions}
+        )
         
         return {
             "success": True,
@@ -161,10 +282,10 @@ class CarbonCalculator:
         Returns:
             Offset impact data
         """
-        if offset_type not in self.OFFSET_FACTORS:
+        factor = self.OFFSET_FACTORS.get(offset_type)
+        if factor is None:
             return self._error_response(f"Unknown offset type: {offset_type}")
         
-        factor = self.OFFSET_FACTORS[offset_type]
         co2_reduced = quantity * factor
         
         return {
@@ -176,35 +297,34 @@ class CarbonCalculator:
             "equivalents": self._calculate_equivalents(co2_reduced, is_offset=True)
         }
     
-    def _calculate_equivalents(self, co2_kg: float, is_offset: bool = False) -> Dict[str, float]:
-        """Calculate relatable equivalents for CO2 amount"""
+    def _calculate_equivalents(
+        self,
+        co2_kg: Union[float, np.ndarray],
+        is_offset: bool = False
+    ) -> Dict[str, Any]:
+        """Calculate relatable equivalents for a CO2 amount or an array of amounts"""
         prefix = "equivalent_to" if not is_offset else "offsets"
+        convert = _converter(co2_kg)
         
         return {
-            f"{prefix}_tree_years": round(co2_kg / 22, 1),  # Trees needed for 1 year
-            f"{prefix}_car_km": round(co2_kg / 0.171, 0),  # Km driven
-            f"{prefix}_flights_short": round(co2_kg / 90, 1)  # Short flights (350km)
+            f"{prefix}_tree_years": convert(_TREE_KG_PER_YEAR, 1),  # Trees needed for 1 year
+            f"{prefix}_car_km": convert(_CAR_KG_PER_KM, 0),  # Km driven
+            f"{prefix}_flights_short": convert(_SHORT_FLIGHT_KG, 1)  # Short flights (350km)
         }
     
-    def _recommend_offsets(self, emissions_kg: float) -> Dict[str, Any]:
-        """Recommend offset actions based on emissions"""
+    def _recommend_offsets(self, emissions_kg: Union[float, np.ndarray]) -> Dict[str, Any]:
+        """Recommend offset actions for an emissions amount or an array of amounts"""
+        convert = _converter(emissions_kg)
+        
         return {
-            "trees_to_plant": round(emissions_kg / 22),
-            "solar_kw_needed": round(emissions_kg / 1000, 2),
-            "renewable_kwh_needed": round(emissions_kg / 0.475, 0)
+            "trees_to_plant": convert(_TREE_KG_PER_YEAR),
+            "solar_kw_needed": convert(_SOLAR_KG_PER_KW, 2),
+            "renewable_kwh_needed": convert(_RENEWABLE_KG_PER_KWH, 0)
         }
     
     def _get_default_unit(self, category: str) -> str:
         """Get default unit for category"""
-        if category in ["car", "bus", "train", "plane", "bike", "walk"]:
-            return "km"
-        elif category in ["electricity", "natural_gas"]:
-            return "kWh"
-        elif category in ["beef", "chicken", "fish", "vegetables", "dairy"]:
-            return "kg"
-        elif category in ["landfill", "recycling", "compost"]:
-            return "kg"
-        return "units"
+        return _DEFAULT_UNIT.get(category, "units")
     
     def _error_response(self, message: str) -> Dict[str, Any]:
         """Standard error response"""
@@ -216,24 +336,20 @@ class CarbonCalculator:
     
     def get_available_categories(self) -> Dict[str, list]:
         """List all available emission categories"""
-        categories = {
-            "transportation": [],
-            "energy": [],
-            "food": [],
-            "waste": []
-        }
+        categories = {group: [] for group in _CATEGORY_GROUPS}
         
-        for category in self.EMISSION_FACTORS.keys():
-            if category in ["car", "bus", "train", "plane", "bike", "walk"]:
-                categories["transportation"].append(category)
-            elif category in ["electricity", "natural_gas"]:
-                categories["energy"].append(category)
-            elif category in ["beef", "chicken", "fish", "vegetables", "dairy"]:
-                categories["food"].append(category)
-            elif category in ["landfill", "recycling", "compost"]:
-                categories["waste"].append(category)
+        for category in self.EMISSION_FACTORS:
+            group = _GROUP_OF.get(category)
+            if group is not None:
+                categories[group].append(category)
         
         return categories
 
+# Integer ids for EMISSION_FACTORS categories, usable with calculate_emissions_fast
+EmissionCategory = IntEnum(
+    "EmissionCategory",
+    {category.upper(): i for category, i in CarbonCalculator._INDEX_OF.items()}
+)
+
 # Global instance
 carbon_calculator = CarbonCalculator()
\ No newline at end of file
@@ -5,13 +5,59 @@ Built-in tool for searching climate news, research papers, and real-time environ
 
 import logging
 import asyncio
+import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+from collections import deque
+from itertools import islice
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Oldest searches are dropped once the history reaches this size
+_MAX_SEARCH_HISTORY = 1000
+
+# Location is the word directly before the first of these query words
+_LOCATION_PATTERN = re.compile(r"(\S+)\s+(?:news|latest|environmental)(?!\S)", re.IGNORECASE)
+
+# Simulated result templates: (title format, snippet, url, source)
+_RESULT_TEMPLATES = (
+    (
+        "Climate Change Impact on {location} - Latest Report 2024",
+        "Recent studies show significant environmental changes affecting urban ecosystems. Temperature increases and pollution levels require immediate action.",
+        "https://example.com/climate-report-2024",
+        "Environmental Science Journal"
+    ),
+    (
+        "Environmental News: {location} Green Initiative Launched",
+        "City launches comprehensive sustainability program aimed at reducing emissions by 30% over the next decade through renewable energy and green infrastructure.",
+        "https://example.com/green-initiative",
+        "Green Tech Today"
+    ),
+    (
+        "Air Quality Index - {location} Real-time Data",
+        "Current AQI readings show moderate pollution levels. PM2.5 concentrations monitored across 15 stations throughout the metropolitan area.",
+        "https://example.com/aqi-data",
+        "Air Quality Monitoring Network"
+    ),
+    (
+        "Urban Sustainability: {location}'s Path to Carbon Neutrality",
+        "Experts outline roadmap for achieving net-zero emissions by 2040, including electric vehicle adoption and building energy efficiency improvements.",
+        "https://example.com/carbon-neutral",
+        "Urban Development Review"
+    ),
+    (
+        "Public Health Alert: {location} Air Quality Concerns",
+        "Health officials recommend limiting outdoor activities as pollution levels exceed safe thresholds. Vulnerable populations should take precautions.",
+        "https://example.com/health-alert",
+        "Public Health Department"
+    )
+)
+
+# Relevance drops by 0.1 per rank
+_RELEVANCE_SCORES = tuple(round(1.0 - (i * 0.1), 2) for i in range(len(_RESULT_TEMPLATES)))
+
 
 class GoogleSearchTool:
     """
@@ -22,7 +68,7 @@ class GoogleSearchTool:
         """Initialize the Google Search Tool."""
         self.api_key = api_key
         self.search_engine_id = search_engine_id
-        self.search_history = []
+        self.search_history = deque(maxlen=_MAX_SEARCH_HISTORY)
         logger.info("GoogleSearchTool initialized")
     
     async def search(self, query: str, num_results: int = 10) -> Dict[str, Any]:
@@ -72,69 +118,23 @@ class GoogleSearchTool:
     
     def _generate_simulated_results(self, query: str, num_results: int) -> List[Dict]:
         """Generate simulated search results."""
-        results = []
-        
-        # Extract location/topic from query for more relevant results
-        query_terms = query.split()
-        location = "Global"
-        
-        # Try to extract location from query
-        for i, term in enumerate(query_terms):
-            if term.lower() in ["news", "latest", "environmental"]:
-                if i > 0:
-                    location = query_terms[i-1]
-                    break
+        # Extract location from query for more relevant results
+        match = _LOCATION_PATTERN.search(query)
+        location = match.group(1) if match else "Global"
         
-        result_templates = [
+        return [
             {
-                "title": f"Climate Change Impact on {location} - Latest Report 2024",
-                "snippet": "Recent studies show significant environmental changes affecting urban ecosystems. Temperature increases and pollution levels require immediate action.",
-                "url": "https://example.com/climate-report-2024",
-                "source": "Environmental Science Journal",
-                "rank": 1,
-                "relevance_score": 1.0
-            },
-            {
-                "title": f"Environmental News: {location} Green Initiative Launched",
-                "snippet": "City launches comprehensive sustainability program aimed at reducing emissions by 30% over the next decade through renewable energy and green infrastructure.",
-                "url": "https://example.com/green-initiative",
-                "source": "Green Tech Today",
-                "rank": 2,
-                "relevance_score": 0.9
-            },
-            {
-                "title": f"Air Quality Index - {location} Real-time Data",
-                "snippet": "Current AQI readings show moderate pollution levels. PM2.5 concentrations monitored across 15 stations throughout the metropolitan area.",
-                "url": "https://example.com/aqi-data",
-                "source": "Air Quality Monitoring Network",
-                "rank": 3,
-                "relevance_score": 0.8
-            },
-            {
-                "title": f"Urban Sustainability: {location}'s Path to Carbon Neutrality",
-                "snippet": "Experts outline roadmap for achieving net-zero emissions by 2040, including electric vehicle adoption and building energy efficiency improvements.",
-                "url": "https://example.com/carbon-neutral",
-                "source": "Urban Development Review",
-                "rank": 4,
-                "relevance_score": 0.75
-            },
-            {
-                "title": f"Public Health Alert: {location} Air Quality Concerns",
-                "snippet": "Health officials recommend limiting outdoor activities as pollution levels exceed safe thresholds. Vulnerable populations should take precautions.",
-                "url": "https://example.com/health-alert",
-                "source": "Public Health Department",
-                "rank": 5,
-                "relevance_score": 0.7
+                "title": title.format(location=location),
+                "snippet": snippet,
+                "url": url,
+                "source": source,
+                "rank": rank,
+                "relevance_score": relevance_score
             }
+            for rank, (title, snippet, url, source), relevance_score in zip(
+                range(1, num_results + 1), _RESULT_TEMPLATES, _RELEVANCE_SCORES
+            )
         ]
-        
-        for i in range(min(num_results, len(result_templates))):
-            result = result_templates[i].copy()
-            result["rank"] = i + 1
-            result["relevance_score"] = round(1.0 - (i * 0.1), 2)
-            results.append(result)
-        
-        return results
     
     def extract_key_information(self, search_results: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key information from search results."""
@@ -157,7 +157,11 @@ class GoogleSearchTool:
     
     def get_search_history(self, limit: int = 10) -> List[Dict]:
         """Retrieve recent search history."""
-        return self.search_history[-limit:]
+        if limit <= 0:
+            return list(self.search_history)[-limit:]
+        recent = list(islice(reversed(self.search_history), limit))
+        recent.reverse()
+        return recent
     
     def clear_history(self):
         """Clear search history."""
@@ -3,11 +3,92 @@ EcoGuardian AI - Weather & Pollution API Tool (OpenAPI Integration)
 Fetches real-time environmental data from OpenWeatherMap
 """
 
+import asyncio
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
 from config.settings import Settings
 from observability.logger import eco_logger
 
+# Response bodies are decoded with orjson when available, stdlib json otherwise
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Matches the session pool size so batched requests never queue for a socket
+_MAX_CONCURRENT_REQUESTS = 16
+
+# (label, health implication) per AQI: 1=Good, 2=Fair, 3=Moderate, 4=Poor,
+# 5=Very Poor; index 0 covers unknown values
+_AQI_INFO = (
+    ("Unknown", "Unknown health implications"),
+    ("Good", "Air quality is satisfactory, and air pollution poses little or no risk."),
+    ("Fair", "Air quality is acceptable. However, there may be a risk for some people who are unusually sensitive to air pollution."),
+    ("Moderate", "Members of sensitive groups may experience health effects. The general public is less likely to be affected."),
+    ("Poor", "Everyone may begin to experience health effects; members of sensitive groups may experience more serious health effects."),
+    ("Very Poor", "Health alert: The risk of health effects is increased for everyone.")
+)
+
+
+def _aqi_info(aqi: Any) -> Tuple[str, str]:
+    """Look up the (label, health implication) pair for an AQI value"""
+    if isinstance(aqi, float) and aqi.is_integer():
+        aqi = int(aqi)  # 3.0 maps like 3, as the old dict lookup did
+    return _AQI_INFO[aqi if isinstance(aqi, int) and 0 <= aqi <= 5 else 0]
+
+
+def ttl_cache(key: Callable[..., Any], ttl_seconds: float = 300, maxsize: int = 512):
+    """
+    Cache successful endpoint responses for ttl_seconds
+    
+    Callers get a shallow copy of the cached response; nested values are
+    shared between callers and must not be mutated.
+    
+    Args:
+        key: Builds the cache key from the method arguments
+        ttl_seconds: How long a response stays fresh
+        maxsize: Least recently used entries are evicted past this size
+    """
+    def decorator(func):
+        cache: "OrderedDict[Any, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        lock = threading.Lock()  # endpoints are called from worker threads
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                cache_key = key(*args, **kwargs)
+            except (TypeError, AttributeError):
+                # Malformed arguments: let the endpoint report the error
+                return func(self, *args, **kwargs)
+            
+            with lock:
+                entry = cache.get(cache_key)
+                if entry is not None and entry[1] > time.monotonic():
+                    cache.move_to_end(cache_key)
+                    return dict(entry[0])
+            
+            result = func(self, *args, **kwargs)
+            
+            # Error responses are not cached so failures don't pin
+            if result.get("success"):
+                with lock:
+                    cache[cache_key] = (dict(result), time.monotonic() + ttl_seconds)
+                    cache.move_to_end(cache_key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
 class WeatherAPITool:
     """
     OpenAPI Tool: Integrates with OpenWeatherMap API
@@ -18,6 +99,21 @@ class WeatherAPITool:
         self.name = "WeatherAPITool"
         self.api_key = Settings.OPENWEATHER_API_KEY
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        self._url_air = f"{self.base_url}/air_pollution"
+        self._url_weather = f"{self.base_url}/weather"
+        self._url_forecast = f"{self.base_url}/forecast"
+        
+        # Pooled keep-alive session so repeated calls reuse TCP/TLS connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_MAX_CONCURRENT_REQUESTS,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[429, 502, 503, 504]
+            )
+        ))
         
         eco_logger.log_agent_action(
             self.name,
@@ -25,6 +121,7 @@ class WeatherAPITool:
             {"api_configured": bool(self.api_key)}
         )
     
+    @ttl_cache(key=lambda lat, lon: (round(lat, 2), round(lon, 2)))
     def get_air_quality(self, lat: float, lon: float) -> Dict[str, Any]:
         """
         Fetch current air quality data for coordinates
@@ -37,18 +134,17 @@ class WeatherAPITool:
             Air quality data with AQI and pollutant levels
         """
         try:
-            url = f"{self.base_url}/air_pollution"
-            params = {
-                "lat": lat,
-                "lon": lon,
-                "appid": self.api_key
-            }
+            params = (
+                ("lat", lat),
+                ("lon", lon),
+                ("appid", self.api_key)
+            )
             
             eco_logger.logger.debug(f"🌍 Fetching air quality for ({lat}, {lon})")
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._url_air, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _loads(response.content)
             
             # Parse API response
             air_quality = self._parse_air_quality(data)
@@ -69,6 +165,28 @@ class WeatherAPITool:
             eco_logger.log_error(self.name, e, {"lat": lat, "lon": lon})
             return self._error_response(str(e))
     
+    async def get_air_quality_batch(
+        self,
+        coords: Iterable[Tuple[float, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch air quality for many coordinates concurrently
+        
+        Args:
+            coords: Iterable of (lat, lon) pairs
+        
+        Returns:
+            Air quality results in the same order as coords
+        """
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        
+        async def fetch(lat: float, lon: float) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self.get_air_quality, lat, lon)
+        
+        return await asyncio.gather(*(fetch(lat, lon) for lat, lon in coords))
+    
+    @ttl_cache(key=lambda city: city.lower())
     def get_weather(self, city: str) -> Dict[str, Any]:
         """
         Fetch current weather data for a city
@@ -80,18 +198,17 @@ class WeatherAPITool:
             Weather data including temperature, humidity, etc.
         """
         try:
-            url = f"{self.base_url}/weather"
-            params = {
-                "q": city,
-                "appid": self.api_key,
-                "units": "metric"  # Celsius
-            }
+            params = (
+                ("q", city),
+                ("appid", self.api_key),
+                ("units", "metric")  # Celsius
+            )
             
             eco_logger.logger.debug(f"☀️ Fetching weather for {city}")
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._url_weather, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _loads(response.content)
             
             # Parse weather data
             weather = self._parse_weather(data)
@@ -112,6 +229,7 @@ class WeatherAPITool:
             eco_logger.log_error(self.name, e, {"city": city})
             return self._error_response(str(e))
     
+    @ttl_cache(key=lambda city, days=3: (city.lower(), days))
     def get_forecast(self, city: str, days: int = 3) -> Dict[str, Any]:
         """
         Get weather forecast for coming days
@@ -124,18 +242,17 @@ class WeatherAPITool:
             Forecast data
         """
         try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                "q": city,
-                "appid": self.api_key,
-                "units": "metric",
-                "cnt": days * 8  # 3-hour intervals
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            params = (
+                ("q", city),
+                ("appid", self.api_key),
+                ("units", "metric"),
+                ("cnt", days * 8)  # 3-hour intervals
+            )
+            
+            response = self.session.get(self._url_forecast, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _loads(response.content)
             forecast = self._parse_forecast(data, days)
             
             eco_logger.log_tool_usage(
@@ -159,14 +276,13 @@ class WeatherAPITool:
         main = aqi_data.get("main", {})
         components = aqi_data.get("components", {})
         
-        # AQI scale: 1=Good, 2=Fair, 3=Moderate, 4=Poor, 5=Very Poor
         aqi = main.get("aqi", 0)
-        aqi_labels = {1: "Good", 2: "Fair", 3: "Moderate", 4: "Poor", 5: "Very Poor"}
+        aqi_label, health_implications = _aqi_info(aqi)
         
         return {
             "success": True,
             "aqi": aqi,
-            "aqi_label": aqi_labels.get(aqi, "Unknown"),
+            "aqi_label": aqi_label,
             "pollutants": {
                 "co": components.get("co", 0),  # Carbon monoxide
                 "no": components.get("no", 0),  # Nitrogen monoxide
@@ -177,7 +293,7 @@ class WeatherAPITool:
                 "pm10": components.get("pm10", 0),  # Coarse particles
                 "nh3": components.get("nh3", 0)  # Ammonia
             },
-            "health_implications": self._get_health_implications(aqi),
+            "health_implications": health_implications,
             "timestamp": aqi_data.get("dt")
         }
     
@@ -209,15 +325,18 @@ class WeatherAPITool:
     
     def _parse_forecast(self, data: Dict, days: int) -> Dict[str, Any]:
         """Parse forecast API response"""
+        # Forecast points stay plain dicts: they are JSON-serialized downstream
         forecasts = []
+        append = forecasts.append
         
-        for item in data.get("list", []):
-            forecasts.append({
+        for item in data.get("list", ()):
+            main = item.get("main", {})
+            append({
                 "timestamp": item.get("dt"),
                 "datetime": item.get("dt_txt"),
-                "temperature_celsius": item.get("main", {}).get("temp"),
+                "temperature_celsius": main.get("temp"),
                 "description": item.get("weather", [{}])[0].get("description", ""),
-                "humidity_percent": item.get("main", {}).get("humidity"),
+                "humidity_percent": main.get("humidity"),
                 "rain_probability": item.get("pop", 0) * 100  # Probability of precipitation
             })
         
@@ -230,14 +349,7 @@ class WeatherAPITool:
     
     def _get_health_implications(self, aqi: int) -> str:
         """Get health implications based on AQI"""
-        implications = {
-            1: "Air quality is satisfactory, and air pollution poses little or no risk.",
-            2: "Air quality is acceptable. However, there may be a risk for some people who are unusually sensitive to air pollution.",
-            3: "Members of sensitive groups may experience health effects. The general public is less likely to be affected.",
-            4: "Everyone may begin to experience health effects; members of sensitive groups may experience more serious health effects.",
-            5: "Health alert: The risk of health effects is increased for everyone."
-        }
-        return implications.get(aqi, "Unknown health implications")
+        return _aqi_info(aqi)[1]
     
     def _error_response(self, message: str) -> Dict[str, Any]:
         """Standard error response"""